@@ -1,19 +1,28 @@
 """the NTSC graphical filter / shader package."""
 from .nes_ntsc import NES_NTSC
+from .nes_ntsc_emphasis import NES_NTSC_EMPHASIS
 from .snes_ntsc import SNES_NTSC
 from .sms_ntsc import SMS_NTSC
 from .color import NES_PALETTE, rgb2nes, nes2rgb
-from .color import rgb32_888_to_rgb16_565, rgb16_565_to_rgb32_888
+from .color import rgb32_888_to_rgb16_565, rgb16_565_to_rgb32_888, rgb2yuv
+from .array_file import filter_array_file
+from .vector_ntsc import VectorNTSC
+from .row_cache import RowCache
 
 
 # explicitly define the outward facing API of the package
 __all__ = [
     'NES_PALETTE',
     NES_NTSC.__name__,
+    NES_NTSC_EMPHASIS.__name__,
     SNES_NTSC.__name__,
     SMS_NTSC.__name__,
+    RowCache.__name__,
+    VectorNTSC.__name__,
+    filter_array_file.__name__,
     nes2rgb.__name__,
     rgb2nes.__name__,
+    rgb2yuv.__name__,
     rgb16_565_to_rgb32_888.__name__,
     rgb32_888_to_rgb16_565.__name__,
 ]
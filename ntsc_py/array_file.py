@@ -0,0 +1,196 @@
+"""Out-of-core filtering of memory-mapped arrays of frames."""
+import multiprocessing
+import os
+import numpy as np
+from .nes_ntsc import NES_NTSC
+from .nes_ntsc_emphasis import NES_NTSC_EMPHASIS
+from .snes_ntsc import SNES_NTSC
+from .sms_ntsc import SMS_NTSC
+from .color import rgb2nes, rgb32_888_to_rgb16_565
+
+
+# the filter classes keyed by the name of the console they model
+CONSOLES = {
+    'nes':  NES_NTSC,
+    'nes_emphasis': NES_NTSC_EMPHASIS,
+    'snes': SNES_NTSC,
+    'sms':  SMS_NTSC,
+}
+
+
+def _to_input(ntsc, frames):
+    """
+    Convert a frame or a batch of frames to the native input format of a filter.
+
+    Args:
+        ntsc: the filter to convert the frames for
+        frames: the frame as palette indexes in HW or HW1 format, or as RGB
+            colors in HW3 format, or a batch of frames in NHW, NHW1, or NHW3
+            format
+
+    Returns:
+        the frames in the (N)HW1 format and data type of `ntsc.input`
+
+    """
+    if frames.shape[-2:] == ntsc.input.shape[:2]:  # indexes without a channel
+        frames = frames[..., None]
+    elif frames.shape[-1] == 3:  # RGB888 frames, convert to the native format
+        if isinstance(ntsc, NES_NTSC):  # including NES_NTSC_EMPHASIS
+            frames = rgb2nes(frames)
+        else:
+            frames = rgb32_888_to_rgb16_565(frames)
+    if frames.shape[-3:] != ntsc.input.shape:
+        raise ValueError(
+            f'expected frames with shape {repr(ntsc.input.shape[:2])}, '
+            f'but received frames with shape {repr(frames.shape)}'
+        )
+    return frames
+
+
+def _filter_chunk(ntsc, src, dst, start, stop):
+    """
+    Filter a contiguous slice of frames from the source to the destination.
+
+    Args:
+        ntsc: the filter to process the frames with
+        src: the memory-mapped array of input frames
+        dst: the memory-mapped array of output frames
+        start: the index of the first frame in the chunk
+        stop: the index after the last frame in the chunk
+
+    Returns:
+        None
+
+    """
+    # convert the whole chunk at once to amortize the color conversion
+    frames = _to_input(ntsc, src[start:stop])
+    for index, frame in enumerate(frames, start):
+        ntsc.input[:] = frame
+        if getattr(ntsc, 'flicker', False):
+            # derive the field from the frame index so that the output does
+            # not depend on how the frames are split into chunks
+            ntsc.process(is_even_frame=index % 2 == 0)
+        else:
+            ntsc.process()
+        dst[index] = ntsc.output
+    dst.flush()
+
+
+# the per-process state of the worker processes
+_WORKER = {}
+
+
+def _initialize_worker(src, dst, console, kwargs):
+    """
+    Initialize a worker process with a filter and the memory-mapped arrays.
+
+    Args:
+        src: the path to the source array file
+        dst: the path to the destination array file
+        console: the name of the console to filter frames for
+        kwargs: the keyword arguments to create the filter with
+
+    Returns:
+        None
+
+    """
+    _WORKER['ntsc'] = CONSOLES[console](**kwargs)
+    _WORKER['src'] = np.load(src, mmap_mode='r')
+    _WORKER['dst'] = np.load(dst, mmap_mode='r+')
+
+
+def _filter_chunk_worker(bounds):
+    """
+    Filter a contiguous slice of frames in a worker process.
+
+    Args:
+        bounds: a tuple of the start and stop index of the slice of frames
+
+    Returns:
+        the stop index of the slice of frames
+
+    """
+    _filter_chunk(_WORKER['ntsc'], _WORKER['src'], _WORKER['dst'], *bounds)
+    return bounds[1]
+
+
+def filter_array_file(src, dst,
+    console='nes',
+    chunk=64,
+    processes=None,
+    start=0,
+    checkpoint=None,
+    **kwargs
+):
+    """
+    Filter a `.npy` file of frames without loading it into memory.
+
+    Args:
+        src: the path to the `.npy` file of input frames. frames are palette
+            indexes in NHW or NHW1 format (uint8 for the NES, uint16 9-bit
+            for the NES with emphasis, uint16 RGB565 for the SNES and SMS)
+            or RGB888 colors in NHW3 format
+        dst: the path to the `.npy` file to write the NHW3 output frames to
+        console: the console to filter for, one of 'nes', 'nes_emphasis',
+            'snes', or 'sms'
+        chunk: the number of frames to process per unit of work
+        processes: the number of worker processes to filter chunks with,
+            `None` to use every core, or 1 to filter in this process
+        start: the index of the frame to start (or resume) filtering from.
+            if greater than 0, `dst` must already exist from a previous call
+        checkpoint: an optional callable that receives the index after the
+            last frame of every contiguous run of completed frames
+        **kwargs: the keyword arguments to create the filter with, e.g.,
+            `mode` and the fields of the setup structure
+
+    Returns:
+        the number of frames in the source file
+
+    """
+    if console not in CONSOLES:  # the console is invalid
+        raise ValueError(f'received invalid console: {repr(console)}, should be one of {set(CONSOLES.keys())}')
+    if chunk < 1:
+        raise ValueError(f'chunk should be a positive integer, but received {repr(chunk)}')
+    source = np.load(src, mmap_mode='r')
+    # the filter in this process determines the shape of the output frames
+    ntsc = CONSOLES[console](**kwargs)
+    frames = len(source)
+    shape = (frames, *ntsc.output.shape)
+    if start > 0:  # resume writing into the existing destination
+        destination = np.load(dst, mmap_mode='r+')
+        if destination.shape != shape:
+            raise ValueError(
+                f'expected destination with shape {repr(shape)} to resume, '
+                f'but found destination with shape {repr(destination.shape)}'
+            )
+        if destination.dtype != np.uint8:
+            raise ValueError(
+                f'expected destination with dtype uint8 to resume, '
+                f'but found destination with dtype {repr(destination.dtype)}'
+            )
+    else:  # preallocate the destination on disk
+        destination = np.lib.format.open_memmap(dst, mode='w+', dtype=np.uint8, shape=shape)
+    # divide the frames into chunks that map to disjoint output slices
+    bounds = [(i, min(i + chunk, frames)) for i in range(start, frames, chunk)]
+    if processes is None:
+        processes = os.cpu_count()
+    if processes == 1 or len(bounds) <= 1:  # filter in this process
+        for bound in bounds:
+            _filter_chunk(ntsc, source, destination, *bound)
+            if checkpoint is not None:
+                checkpoint(bound[1])
+        return frames
+    # the workers open their own views of the files and filters
+    destination.flush()
+    del ntsc, source, destination
+    initargs = (src, dst, console, kwargs)
+    with multiprocessing.Pool(processes, _initialize_worker, initargs) as pool:
+        # results are ordered, so each one marks a contiguous completed run
+        for stop in pool.imap(_filter_chunk_worker, bounds):
+            if checkpoint is not None:
+                checkpoint(stop)
+    return frames
+
+
+# explicitly define the outward facing API of this module
+__all__ = [filter_array_file.__name__]
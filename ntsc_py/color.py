@@ -23,26 +23,51 @@ NES_PALETTE = np.array([
 ], dtype=np.uint8)
 
 
+# the NES palette indexes keyed by packed 24-bit RGB colors, filled lazily
+# with the nearest palette index of each color that `rgb2nes` converts
+_RGB2NES = None
+# the value of colors in the lookup table that are not converted yet
+_RGB2NES_UNKNOWN = 255
+
+
 def rgb2nes(img):
     """
     Convert the RGB image to NES palette.
 
     Args:
-        img: the image in HWC format and RGB color space
+        img: the image in HWC format and RGB color space, or a batch of
+            images in NHWC format
 
     Returns:
         a matrix of NES color palette indexes that closely match the RGB colors
 
     """
+    global _RGB2NES
     if not isinstance(img, np.ndarray):
         img = np.array(img)
     img = img.astype(np.uint8)
 
-    # compute the MSE between the image and each color in the palette
-    distance = (img.astype(float) - NES_PALETTE[:, None, None, :].astype(float))**2
-    distance = np.mean(distance, axis=-1, keepdims=True)
-    # return the color with the lowest error as the code for each RGB tuple
-    return np.argmin(distance, axis=0).astype(np.uint8)
+    if _RGB2NES is None:  # create the lookup table with the palette colors
+        _RGB2NES = np.full(1 << 24, _RGB2NES_UNKNOWN, dtype=np.uint8)
+        # assign in reverse so repeated colors map to their first index
+        packed = NES_PALETTE.astype(np.uint32)
+        packed = packed[:, 0] << 16 | packed[:, 1] << 8 | packed[:, 2]
+        _RGB2NES[packed[::-1]] = np.arange(len(NES_PALETTE))[::-1]
+    # pack the colors into 24-bit keys of the lookup table
+    rgb = img.astype(np.uint32)
+    packed = rgb[..., 0] << 16 | rgb[..., 1] << 8 | rgb[..., 2]
+    indexes = _RGB2NES[packed]
+    unknown = indexes == _RGB2NES_UNKNOWN
+    if unknown.any():  # convert the colors that are not in the table yet
+        colors = np.unique(packed[unknown])
+        channels = np.stack([colors >> 16, colors >> 8 & 0xFF, colors & 0xFF], axis=-1)
+        # compute the MSE between each color and each color in the palette
+        distance = (channels[:, None, :].astype(float) - NES_PALETTE[None, :, :].astype(float))**2
+        distance = np.mean(distance, axis=-1)
+        # store the color with the lowest error as the code for each color
+        _RGB2NES[colors] = np.argmin(distance, axis=1)
+        indexes = _RGB2NES[packed]
+    return indexes[..., None]
 
 
 def nes2rgb(img):
@@ -114,6 +139,38 @@ def rgb16_565_to_rgb32_888(img):
     return np.concatenate([r, g, b], axis=-1)
 
 
+def rgb2yuv(img, subsample=True):
+    """
+    Convert the RGB image to planar BT.601 limited-range YUV.
+
+    Args:
+        img: the image in HWC format and RGB color space
+        subsample: whether to average the chroma of each 2x2 block of pixels
+            (4:2:0) instead of keeping the chroma of every pixel (4:4:4)
+
+    Returns:
+        a tuple of the Y, U, and V planes as uint8 matrices. the U and V
+        planes have shape ((H + 1) // 2, (W + 1) // 2) if subsampled
+
+    """
+    if not isinstance(img, np.ndarray):
+        img = np.array(img)
+    img = img.astype(float)
+
+    r, g, b = img[..., 0], img[..., 1], img[..., 2]
+    y = 16 + (65.481 * r + 128.553 * g + 24.966 * b) / 255
+    u = 128 + (-37.797 * r - 74.203 * g + 112.0 * b) / 255
+    v = 128 + (112.0 * r - 93.786 * g - 18.214 * b) / 255
+    if subsample:  # average the chroma of each 2x2 block of pixels
+        height, width = u.shape
+        pad = ((0, height % 2), (0, width % 2))
+        u = np.pad(u, pad, mode='edge')
+        v = np.pad(v, pad, mode='edge')
+        u = (u[0::2, 0::2] + u[0::2, 1::2] + u[1::2, 0::2] + u[1::2, 1::2]) / 4
+        v = (v[0::2, 0::2] + v[0::2, 1::2] + v[1::2, 0::2] + v[1::2, 1::2]) / 4
+    return tuple(plane.round().clip(0, 255).astype(np.uint8) for plane in (y, u, v))
+
+
 # explicitly define the outward facing API of this module
 __all__ = [
     'NES_PALETTE',
@@ -121,4 +178,5 @@ __all__ = [
     nes2rgb.__name__,
     rgb32_888_to_rgb16_565.__name__,
     rgb16_565_to_rgb32_888.__name__,
+    rgb2yuv.__name__,
 ]
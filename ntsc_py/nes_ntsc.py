@@ -1,21 +1,9 @@
 """A CTypes interface to Blargg's C++ NES NTSC filter."""
 import ctypes
+import types
 from ._library import LIBRARY
-from .utility import ndarray_from_byte_buffer
-
-
-# setup the argument and return types for NES_NTSC_HEIGHT
-LIBRARY.NES_NTSC_HEIGHT.argtypes = None
-LIBRARY.NES_NTSC_HEIGHT.restype = ctypes.c_uint
-# setup the argument and return types for NES_NTSC_WIDTH_INPUT
-LIBRARY.NES_NTSC_WIDTH_INPUT.argtypes = None
-LIBRARY.NES_NTSC_WIDTH_INPUT.restype = ctypes.c_uint
-# setup the argument and return types for NES_NTSC_WIDTH_OUTPUT
-LIBRARY.NES_NTSC_WIDTH_OUTPUT.argtypes = None
-LIBRARY.NES_NTSC_WIDTH_OUTPUT.restype = ctypes.c_uint
-# setup the argument and return types for NES_NTSC_PITCH
-LIBRARY.NES_NTSC_PITCH.argtypes = None
-LIBRARY.NES_NTSC_PITCH.restype = ctypes.c_uint
+from .row_cache import RowCache
+from .utility import ndarray_from_byte_buffer, preview_output, yuv_subsampling
 
 
 class nes_ntsc_t(ctypes.Structure):
@@ -25,14 +13,6 @@ class nes_ntsc_t(ctypes.Structure):
     ]
 
 
-# setup the argument and return types for NES_NTSC_InitializeConfiguration
-LIBRARY.NES_NTSC_InitializeConfiguration.argtypes = None
-LIBRARY.NES_NTSC_InitializeConfiguration.restype = ctypes.POINTER(nes_ntsc_t)
-# setup the argument and return types for NES_NTSC_DestroyConfiguration
-LIBRARY.NES_NTSC_DestroyConfiguration.argtypes = [ctypes.POINTER(nes_ntsc_t)]
-LIBRARY.NES_NTSC_DestroyConfiguration.restype = None
-
-
 class nes_ntsc_setup_t(ctypes.Structure):
     """A reference to the `nes_ntsc_setup_t` structure in C."""
     _fields_ = [
@@ -54,57 +34,91 @@ class nes_ntsc_setup_t(ctypes.Structure):
     ]
 
 
-# setup the argument and return types for NES_NTSC_InitializeSetup
-LIBRARY.NES_NTSC_InitializeSetup.argtypes = None
-LIBRARY.NES_NTSC_InitializeSetup.restype = ctypes.POINTER(nes_ntsc_setup_t)
-# setup the argument and return types for NES_NTSC_DestroySetup
-LIBRARY.NES_NTSC_DestroySetup.argtypes = [ctypes.POINTER(nes_ntsc_setup_t)]
-LIBRARY.NES_NTSC_DestroySetup.restype = None
-# setup the argument and return types for NES_NTSC_SetupComposite
-LIBRARY.NES_NTSC_SetupComposite.argtypes = [ctypes.POINTER(nes_ntsc_setup_t)]
-LIBRARY.NES_NTSC_SetupComposite.restype = None
-# setup the argument and return types for NES_NTSC_SetupSVideo
-LIBRARY.NES_NTSC_SetupSVideo.argtypes = [ctypes.POINTER(nes_ntsc_setup_t)]
-LIBRARY.NES_NTSC_SetupSVideo.restype = None
-# setup the argument and return types for NES_NTSC_SetupRGB
-LIBRARY.NES_NTSC_SetupRGB.argtypes = [ctypes.POINTER(nes_ntsc_setup_t)]
-LIBRARY.NES_NTSC_SetupRGB.restype = None
-# setup the argument and return types for NES_NTSC_SetupMonochrome
-LIBRARY.NES_NTSC_SetupMonochrome.argtypes = [ctypes.POINTER(nes_ntsc_setup_t)]
-LIBRARY.NES_NTSC_SetupMonochrome.restype = None
-
-
-# setup the argument and return types for NES_NTSC_InitializeInputPixels
-LIBRARY.NES_NTSC_InitializeInputPixels.argtypes = None
-LIBRARY.NES_NTSC_InitializeInputPixels.restype = ctypes.c_void_p
-# setup the argument and return types for NES_NTSC_DestroyInputPixels
-LIBRARY.NES_NTSC_DestroyInputPixels.argtypes = [ctypes.c_void_p]
-LIBRARY.NES_NTSC_DestroyInputPixels.restype = None
+def _setup_library(prefix):
+    """
+    Setup the argument and return types of the functions of an NES library.
 
+    Args:
+        prefix: the prefix of the functions of the library, i.e., 'NES_NTSC_'
+            for the 64-color library or 'NES_NTSC_EMPHASIS_' for the 512-color
+            library that `lib_nes_ntsc_emphasis.cpp` builds from the same code
 
-# setup the argument and return types for NES_NTSC_InitializeOutputPixels
-LIBRARY.NES_NTSC_InitializeOutputPixels.argtypes = None
-LIBRARY.NES_NTSC_InitializeOutputPixels.restype = ctypes.c_void_p
-# setup the argument and return types for NES_NTSC_DestroyOutputPixels
-LIBRARY.NES_NTSC_DestroyOutputPixels.argtypes = [ctypes.c_void_p]
-LIBRARY.NES_NTSC_DestroyOutputPixels.restype = None
+    Returns:
+        a namespace of the functions keyed by their names without the prefix
 
-
-# setup the argument and return types for NES_NTSC_Process
-LIBRARY.NES_NTSC_Process.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.POINTER(nes_ntsc_t), ctypes.c_bool]
-LIBRARY.NES_NTSC_Process.restype = None
+    """
+    config = ctypes.POINTER(nes_ntsc_t)
+    setup = ctypes.POINTER(nes_ntsc_setup_t)
+    pointer = ctypes.c_void_p
+    # the argument and return types of the functions keyed by their names
+    signatures = {
+        # constants
+        'HEIGHT': (None, ctypes.c_uint),
+        'WIDTH_INPUT': (None, ctypes.c_uint),
+        'WIDTH_OUTPUT': (None, ctypes.c_uint),
+        'PITCH': (None, ctypes.c_uint),
+        # configuration
+        'InitializeConfiguration': (None, config),
+        'DestroyConfiguration': ([config], None),
+        'InitializeFastConfiguration': (None, pointer),
+        'DestroyFastConfiguration': ([pointer], None),
+        # setup
+        'InitializeSetup': (None, setup),
+        'DestroySetup': ([setup], None),
+        'SetupComposite': ([setup], None),
+        'SetupSVideo': ([setup], None),
+        'SetupRGB': ([setup], None),
+        'SetupMonochrome': ([setup], None),
+        'SetupApply': ([config, setup], None),
+        'SetupFast': ([pointer, config], ctypes.c_uint32),
+        # pixel buffers
+        'InitializeInputPixels': (None, pointer),
+        'DestroyInputPixels': ([pointer], None),
+        'InitializeOutputPixels': (None, pointer),
+        'DestroyOutputPixels': ([pointer], None),
+        # processing
+        'Process': ([pointer, pointer, config, ctypes.c_bool], None),
+        'ProcessFast': ([pointer, pointer, pointer, ctypes.c_bool], None),
+        'ProcessCached': ([pointer, pointer, config, pointer, pointer, ctypes.c_bool], None),
+        'ProcessYUV': ([pointer, pointer, pointer, pointer, config, pointer, pointer, ctypes.c_bool, ctypes.c_bool], None),
+        'ProcessPreview': ([pointer, pointer, config, pointer, ctypes.c_bool, ctypes.c_uint, ctypes.c_uint], None),
+        'ProcessBatch': ([pointer, pointer, config, pointer, pointer, ctypes.c_uint, ctypes.c_bool, *[ctypes.c_uint] * 6], None),
+    }
+    functions = {}
+    for name, (argtypes, restype) in signatures.items():
+        function = getattr(LIBRARY, prefix + name)
+        function.argtypes = argtypes
+        function.restype = restype
+        functions[name] = function
+    return types.SimpleNamespace(**functions)
 
 
 class NES_NTSC:
     """A graphical filter that models the Nintendo Entertainment System."""
 
-    def __init__(self, mode='rgb', flicker=False, **kwargs):
+    # the functions of the native library
+    _LIBRARY = _setup_library('NES_NTSC_')
+    # the ctypes and numpy data types of the input pixels
+    _INPUT_TYPE = ctypes.c_byte, 'uint8'
+
+    def __init__(self, mode='rgb', flicker=False, tolerance=None, cache_size=None, **kwargs):
         """
-        Initialize a new NES NES_NTSC graphical filter.
+        Initialize a new NES_NTSC graphical filter.
 
         Args:
             mode: the video mode to initialize the filter with
             flicker: whether to flicker between renders
+            tolerance: the largest difference of any 8-bit output channel to
+                accept from the fast filter, or None to disable it. the fast
+                filter evaluates three of the six kernels of each output
+                pixel, which suits setups without artifacts or fringing like
+                the 'rgb' mode. `fast_error` bounds its difference from the
+                reference filter for the current setup (6 for the 'rgb' mode,
+                255 for setups whose sums may overflow the output clamp)
+            cache_size: the number of bytes to cache filtered rows in, or None
+                to disable the cache. rows that repeat from frame to frame, like
+                static backgrounds and borders, are copied from the cache
+                instead of being filtered again
             **kwargs: the keyword arguments to pass to the setup structure
 
         Returns:
@@ -112,27 +126,36 @@ class NES_NTSC:
 
         """
         # create the configuration structure that holds the options
-        self._config = LIBRARY.NES_NTSC_InitializeConfiguration()
-        self._setup = LIBRARY.NES_NTSC_InitializeSetup()
-        self._input = LIBRARY.NES_NTSC_InitializeInputPixels()
-        self._output = LIBRARY.NES_NTSC_InitializeOutputPixels()
+        self._config = self._LIBRARY.InitializeConfiguration()
+        self._setup = self._LIBRARY.InitializeSetup()
+        self._input = self._LIBRARY.InitializeInputPixels()
+        self._output = self._LIBRARY.InitializeOutputPixels()
+        self._fast = self._LIBRARY.InitializeFastConfiguration()
         # create the input and output buffers
-        shape_input = LIBRARY.NES_NTSC_HEIGHT(), LIBRARY.NES_NTSC_WIDTH_INPUT(), 1
-        self.input = ndarray_from_byte_buffer(self._input, shape_input)
-        shape_output = LIBRARY.NES_NTSC_HEIGHT(), LIBRARY.NES_NTSC_WIDTH_OUTPUT(), 4
+        shape_input = self._LIBRARY.HEIGHT(), self._LIBRARY.WIDTH_INPUT(), 1
+        ctype, dtype = self._INPUT_TYPE
+        self.input = ndarray_from_byte_buffer(self._input, shape_input, ctype=ctype, dtype=dtype)
+        shape_output = self._LIBRARY.HEIGHT(), self._LIBRARY.WIDTH_OUTPUT(), 4
         self.output = ndarray_from_byte_buffer(self._output, shape_output)[:, :, 1:]
         # setup the flicker effect
         self.flicker = flicker
         self._is_even_frame = False
+        # setup the fast filter
+        self._tolerance = tolerance
+        self.fast_error = None
+        self.is_fast = False
+        # setup the cache of filtered rows
+        self.cache = None if cache_size is None else RowCache(cache_size)
         # setup the mode
         self.setup(mode=mode, **kwargs)
 
     def __del__(self):
-        """Delete an instance of NES_NTSC."""
-        LIBRARY.NES_NTSC_DestroyConfiguration(self._config)
-        LIBRARY.NES_NTSC_DestroySetup(self._setup)
-        LIBRARY.NES_NTSC_DestroyInputPixels(self._input)
-        LIBRARY.NES_NTSC_DestroyOutputPixels(self._output)
+        """Delete an instance of the filter."""
+        self._LIBRARY.DestroyConfiguration(self._config)
+        self._LIBRARY.DestroySetup(self._setup)
+        self._LIBRARY.DestroyInputPixels(self._input)
+        self._LIBRARY.DestroyOutputPixels(self._output)
+        self._LIBRARY.DestroyFastConfiguration(self._fast)
 
     def setup(self, mode=None, **kwargs):
         """
@@ -148,10 +171,10 @@ class NES_NTSC:
         """
         # the preset modes to start with
         MODES = {
-            'composite':  LIBRARY.NES_NTSC_SetupComposite,
-            'svideo':     LIBRARY.NES_NTSC_SetupSVideo,
-            'rgb':        LIBRARY.NES_NTSC_SetupRGB,
-            'monochrome': LIBRARY.NES_NTSC_SetupMonochrome,
+            'composite':  self._LIBRARY.SetupComposite,
+            'svideo':     self._LIBRARY.SetupSVideo,
+            'rgb':        self._LIBRARY.SetupRGB,
+            'monochrome': self._LIBRARY.SetupMonochrome,
         }
         if mode is not None:  # a preset mode was specified
             if mode not in MODES:  # the mode is invalid
@@ -162,13 +185,116 @@ class NES_NTSC:
         for kwarg, value in kwargs.items():
             setattr(self._setup[0], kwarg, value)
         # apply the setup to the configuration
-        LIBRARY.NES_NTSC_SetupApply(self._config, self._setup)
+        self._LIBRARY.SetupApply(self._config, self._setup)
+        # apply the configuration to the fast filter and bound its error
+        self.fast_error = self._LIBRARY.SetupFast(self._fast, self._config)
+        self.is_fast = self._tolerance is not None and self.fast_error <= self._tolerance
+        if self.cache is not None:  # the cached rows are stale
+            self.cache.clear()
+
+    def process(self, is_even_frame=None):
+        """
+        Process the input pixels.
+
+        Args:
+            is_even_frame: the field to render, e.g., derived from the index
+                of the frame, or None to alternate between the fields on every
+                call if flickering
 
-    def process(self):
-        """Process the input pixels."""
+        Returns:
+            None
+
+        """
+        if is_even_frame is not None:  # render the given field
+            self._is_even_frame = bool(is_even_frame)
+        elif self.flicker:  # flip the even frame accumulator if flickering
+            self._is_even_frame = not self._is_even_frame
+        if self.cache is not None:  # filter the rows through the cache
+            self._LIBRARY.ProcessCached(self._output, self._input, self._config, self._fast if self.is_fast else None, self.cache._cache, self._is_even_frame)
+        elif self.is_fast:  # the fast filter is within the tolerance
+            self._LIBRARY.ProcessFast(self._output, self._input, self._fast, self._is_even_frame)
+        else:
+            self._LIBRARY.Process(self._output, self._input, self._config, self._is_even_frame)
+
+    def process_yuv(self, y, u, v, is_even_frame=None):
+        """
+        Process the input pixels into planar BT.601 limited-range YUV.
+
+        Args:
+            y: the C-contiguous uint8 array to write the Y plane to with the
+                height and width of `output`
+            u: the C-contiguous uint8 array to write the U plane to with half
+                of the height and width of `output` rounded up for 4:2:0
+                chroma, or the height and width of `output` for 4:4:4 chroma
+            v: the C-contiguous uint8 array to write the V plane to with the
+                shape of `u`
+            is_even_frame: the field to render, e.g., derived from the index
+                of the frame, or None to alternate between the fields on every
+                call if flickering
+
+        Returns:
+            None
+
+        """
+        subsample = yuv_subsampling(self.output.shape[:2], y, u, v)
+        if is_even_frame is not None:  # render the given field
+            self._is_even_frame = bool(is_even_frame)
+        elif self.flicker:  # flip the even frame accumulator if flickering
+            self._is_even_frame = not self._is_even_frame
+        cache = None if self.cache is None else self.cache._cache
+        self._LIBRARY.ProcessYUV(y.ctypes.data, u.ctypes.data, v.ctypes.data, self._input, self._config, self._fast if self.is_fast else None, cache, subsample, self._is_even_frame)
+
+    def process_preview(self, step=4, output=None, coarse=False, is_even_frame=None):
+        """
+        Process the input pixels into a reduced-size preview.
+
+        The preview samples every `step`-th row and column of `output` with
+        the kernel table of the current setup, so it matches the full-size
+        output at those pixels without filtering the pixels in between. The
+        preview does not advance the flicker, so a preview after `process`
+        renders the same field as the full-size output of that frame.
+
+        Args:
+            step: the step between sampled output pixels as an integer or a
+                pair of integers for the rows and the columns
+            output: the C-contiguous HW3 uint8 array to write the preview to
+                with the height and width of `output` divided by the step and
+                rounded up, or None to allocate a new array
+            coarse: whether to sample the coarsened kernel table of the fast
+                filter, which evaluates three of the six kernels per output
+                pixel, instead of the full table (always True if `is_fast`)
+            is_even_frame: the field to render, or None to render the field of
+                the last call to `process`
+
+        Returns:
+            the HW3 uint8 array of the preview
+
+        """
+        output, row_step, column_step = preview_output(self.output.shape[:2], step, output)
+        if is_even_frame is None:  # render the field of the last frame
+            is_even_frame = self._is_even_frame
+        self._LIBRARY.ProcessPreview(output.ctypes.data, self._input, self._config, self._fast if coarse or self.is_fast else None, bool(is_even_frame), row_step, column_step)
+        return output
+
+    def _process_batch(self, output, input, bounds):
+        """
+        Process a batch of frames with a single call to the native filter.
+
+        Args:
+            output: the contiguous NHW3 uint8 array to write the RGB output to
+            input: the contiguous NHW1 array of input frames in the format of
+                `input`
+            bounds: the tuple of (top, bottom, row step, left, right, column
+                step) that selects the output pixels to keep
+
+        Returns:
+            None
+
+        """
         if self.flicker:  # flip the even frame accumulator if flickering
             self._is_even_frame = not self._is_even_frame
-        LIBRARY.NES_NTSC_Process(self._output, self._input, self._config, self._is_even_frame)
+        cache = None if self.cache is None else self.cache._cache
+        self._LIBRARY.ProcessBatch(output.ctypes.data, input.ctypes.data, self._config, self._fast if self.is_fast else None, cache, len(input), self._is_even_frame, *bounds)
 
 
 # explicitly define the outward facing API of this module
@@ -0,0 +1,25 @@
+"""A CTypes interface to Blargg's C++ NES NTSC filter with color emphasis."""
+import ctypes
+from .nes_ntsc import NES_NTSC, _setup_library
+
+
+class NES_NTSC_EMPHASIS(NES_NTSC):
+    """
+    A graphical filter that models the NES with color emphasis.
+
+    `input` holds 9-bit pixels with the 6-bit palette index in the low bits
+    and the 3 emphasis bits of the PPU mask register ($2001 bits 5 to 7) above
+    it, i.e., `index | (mask >> 5) << 6`. The kernel table holds all 512
+    colors, so emphasis costs nothing extra per frame. The filter shares the
+    interface and the native code of `NES_NTSC`.
+
+    """
+
+    # the functions of the native library
+    _LIBRARY = _setup_library('NES_NTSC_EMPHASIS_')
+    # the ctypes and numpy data types of the input pixels
+    _INPUT_TYPE = ctypes.c_uint16, 'uint16'
+
+
+# explicitly define the outward facing API of this module
+__all__ = [NES_NTSC_EMPHASIS.__name__]
@@ -15,11 +15,15 @@ handle things however it wants. */
 
 /* Type of input pixel values. You'll probably use unsigned short
 if you enable emphasis above. */
-#define NES_NTSC_IN_T unsigned char
+#ifndef NES_NTSC_IN_T
+	#define NES_NTSC_IN_T unsigned char
+#endif
 
 /* Each raw pixel input value is passed through this. You might want to mask
 the pixel index if you use the high bits as flags, etc. */
-#define NES_NTSC_ADJ_IN( in ) in
+#ifndef NES_NTSC_ADJ_IN
+	#define NES_NTSC_ADJ_IN( in ) in
+#endif
 
 /* For each pixel, this is the basic operation:
 output_color = color_palette [NES_NTSC_ADJ_IN( NES_NTSC_IN_T )] */
@@ -0,0 +1,55 @@
+// The NES NTSC filter with the 512-color emphasis palette.
+// Copyright 2021 Christian Kauten
+//
+// Author: Christian Kauten (kautenja@auburn.edu)
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+
+#ifndef NES_NTSC_EMPHASIS_H_
+#define NES_NTSC_EMPHASIS_H_
+
+#ifdef NES_NTSC_H
+    #error "nes_ntsc_emphasis.h replaces nes_ntsc.h in a translation unit"
+#endif
+
+#include <cstdint>
+
+// Blargg's filter selects the palette size, the input type, and the names
+// of its symbols at compile time. This header configures the filter for the
+// 512-color palette and renames its external symbols so that the emphasis
+// variant links into the same library as the 64-color variant, whose code
+// is untouched.
+
+// use the 512-color palette with the emphasis bits in bits 6, 7, and 8
+#define NES_NTSC_EMPHASIS 1
+// read 9-bit palette indexes and ignore the unused high bits
+#define NES_NTSC_IN_T uint16_t
+#define NES_NTSC_ADJ_IN(in) ((in) & 0x1FF)
+// rename the external symbols of the filter
+#define nes_ntsc_t nes_ntsc_emphasis_t
+#define nes_ntsc_init nes_ntsc_emphasis_init
+#define nes_ntsc_blit nes_ntsc_emphasis_blit
+#define nes_ntsc_composite nes_ntsc_emphasis_composite
+#define nes_ntsc_svideo nes_ntsc_emphasis_svideo
+#define nes_ntsc_rgb nes_ntsc_emphasis_rgb
+#define nes_ntsc_monochrome nes_ntsc_emphasis_monochrome
+#define nes_ntsc_pixels nes_ntsc_emphasis_pixels
+// rename the external symbols of the fast filter
+#define nes_ntsc_fast_t nes_ntsc_emphasis_fast_t
+#define nes_ntsc_fast_init nes_ntsc_emphasis_fast_init
+#define nes_ntsc_fast_blit nes_ntsc_emphasis_fast_blit
+#define nes_ntsc_fast_preview nes_ntsc_emphasis_fast_preview
+
+#include "nes_ntsc.h"
+
+#endif  // NES_NTSC_EMPHASIS_H_
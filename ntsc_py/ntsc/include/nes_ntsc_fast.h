@@ -0,0 +1,83 @@
+// A reduced NES NTSC blitter for configurations without artifacts.
+// Copyright 2021 Christian Kauten
+//
+// Author: Christian Kauten (kautenja@auburn.edu)
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+
+#ifndef NES_NTSC_FAST_H_
+#define NES_NTSC_FAST_H_
+
+#include <cstdint>
+#include "nes_ntsc.h"
+
+/// @brief A kernel table that evaluates three of the six kernels per pixel.
+///
+/// @details
+/// Without artifacts and fringing, each output pixel depends almost entirely
+/// on three of the six kernels that `NES_NTSC_RGB_OUT_14_` sums. The fast
+/// table keeps the entries of those kernels and folds the entries of the
+/// remaining kernels for black into them, so the blitter does half of the
+/// lookups and adds per output pixel. The packed arithmetic of the blitter
+/// never carries information downward, so the table holds the low 32 bits
+/// of each entry of `nes_ntsc_t` in half of the memory.
+///
+struct nes_ntsc_fast_t {
+    uint32_t table[nes_ntsc_palette_size][nes_ntsc_entry_size];
+};
+
+/// @brief Initialize the fast table from a reference table.
+///
+/// @param fast the fast table to initialize
+/// @param ntsc the reference table initialized by `nes_ntsc_init`
+/// @returns an upper bound on the difference of any 8-bit output channel
+/// between the fast blitter and `nes_ntsc_blit`, or 255 if a packed channel
+/// sum of either blitter may leave the range of `NES_NTSC_CLAMP_`
+///
+uint32_t nes_ntsc_fast_init(nes_ntsc_fast_t* fast, const nes_ntsc_t* ntsc);
+
+/// @brief Filter one or more rows of pixels with the fast table.
+///
+/// @details
+/// The parameters match those of `nes_ntsc_blit`.
+///
+void nes_ntsc_fast_blit(
+    const nes_ntsc_fast_t* fast,
+    const NES_NTSC_IN_T* input,
+    long in_row_width,
+    int burst_phase,
+    int in_width,
+    int in_height,
+    void* rgb_out,
+    long out_pitch
+);
+
+/// @brief Filter every `step`-th output pixel of a row with the fast table.
+///
+/// @param fast the fast table initialized by `nes_ntsc_fast_init`
+/// @param input the row of input pixels to read
+/// @param burst_phase the burst phase of the row
+/// @param in_width the number of input pixels in the row
+/// @param step the number of output pixels to advance between sampled pixels
+/// @param rgb_out the buffer to write a packed RGB pixel to per sampled pixel
+///
+void nes_ntsc_fast_preview(
+    const nes_ntsc_fast_t* fast,
+    const NES_NTSC_IN_T* input,
+    int burst_phase,
+    int in_width,
+    uint32_t step,
+    uint32_t* rgb_out
+);
+
+#endif  // NES_NTSC_FAST_H_
@@ -0,0 +1,67 @@
+// Sampling of individual output pixels for reduced-size previews.
+// Copyright 2021 Christian Kauten
+//
+// Author: Christian Kauten (kautenja@auburn.edu)
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+
+#ifndef PREVIEW_H_
+#define PREVIEW_H_
+
+#include <cstdint>
+
+/// the smallest step between sampled columns at which filtering only the
+/// sampled pixels of a row is faster than filtering the whole row, which
+/// reuses each kernel lookup across several output pixels
+static const uint32_t PREVIEW_SAMPLE_STEP = 8;
+
+/// @brief Find the input pixels whose kernels contribute to an output pixel.
+///
+/// @details
+/// The 3-to-7 blitters of the NES, SNES, and SMS filters start each row with
+/// two black pixels, read three input pixels per chunk of seven output
+/// pixels, and sum six kernels per output pixel: those of the three current
+/// pixels (0, 1, 2) and those of the three previous pixels (x0, x1, x2). An
+/// input pixel updates its kernel part way through the chunk, so the pixels
+/// depend on the position of the output pixel in the chunk. Indexes before
+/// the first or after the last input pixel stand for black.
+///
+/// @param x the index of the output pixel in the row
+/// @param taps the array of 6 indexes of input pixels to write in the order
+/// (0, 1, 2, x0, x1, x2)
+///
+inline void preview_taps(uint32_t x, int* taps) {
+    // the index of the first input pixel of the chunk, less one
+    const int base = 3 * static_cast<int>(x / 7);
+    const uint32_t index = x % 7;
+    taps[0] = base + 1;
+    taps[3] = base - 2;
+    // the second pixel of the chunk takes over at output pixel 2
+    taps[1] = index < 2 ? base - 1 : base + 2;
+    taps[4] = index < 2 ? base - 4 : base - 1;
+    // the third pixel of the chunk takes over at output pixel 4
+    taps[2] = index < 4 ? base : base + 3;
+    taps[5] = index < 4 ? base - 3 : base;
+}
+
+/// @brief Return the number of output pixels that a preview samples.
+///
+/// @param size the number of pixels in the full-size output
+/// @param step the number of pixels to advance between sampled pixels
+/// @returns the number of sampled pixels, i.e., size / step rounded up
+///
+inline uint32_t preview_size(uint32_t size, uint32_t step) {
+    return (size + step - 1) / step;
+}
+
+#endif  // PREVIEW_H_
@@ -0,0 +1,171 @@
+// A least-recently-used cache of filtered scan lines.
+// Copyright 2021 Christian Kauten
+//
+// Author: Christian Kauten (kautenja@auburn.edu)
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+
+#ifndef ROW_CACHE_H_
+#define ROW_CACHE_H_
+
+#include <cstdint>
+#include <cstring>
+#include <iterator>
+#include <list>
+#include <unordered_map>
+#include <vector>
+
+/// @brief A least-recently-used cache of filtered scan lines.
+///
+/// @details
+/// The output of a scan line depends only on its input pixels, its burst
+/// phase, and the kernel table. Entries are keyed on a hash of the input
+/// pixels, the burst phase, and the generation of the kernel table, and
+/// store a copy of the input pixels to rule out hash collisions. The cache
+/// evicts the least recently used entries to stay within a byte budget.
+///
+class RowCache {
+ public:
+    /// the number of rows that were copied from the cache
+    uint64_t hits = 0;
+    /// the number of rows that were filtered and stored in the cache
+    uint64_t misses = 0;
+
+    /// @brief Initialize a new row cache.
+    ///
+    /// @param budget the largest number of bytes the entries may occupy
+    ///
+    explicit RowCache(uint64_t budget) : budget(budget) { }
+
+    /// @brief Drop every entry and start a new table generation.
+    ///
+    /// @details
+    /// Call this whenever the kernel table changes.
+    ///
+    void clear() {
+        entries.clear();
+        index.clear();
+        bytes = 0;
+        generation++;
+    }
+
+    /// @brief Copy a row from the cache, or filter it and cache the result.
+    ///
+    /// @param input the input pixels of the row
+    /// @param input_bytes the number of bytes in the input row
+    /// @param burst the burst phase of the row
+    /// @param output the output pixels of the row to write to
+    /// @param output_bytes the number of bytes in the output row
+    /// @param filter a callable that filters the row into `output`
+    ///
+    template<typename Filter>
+    void blit(
+        const void* input,
+        std::size_t input_bytes,
+        int burst,
+        void* output,
+        std::size_t output_bytes,
+        Filter filter
+    ) {
+        const uint64_t key = hash(input, input_bytes) ^ (burst * 0x9E3779B97F4A7C15ull) ^ generation;
+        auto found = index.find(key);
+        if (found != index.end()) {
+            auto entry = found->second;
+            if (entry->burst == burst && entry->input.size() == input_bytes &&
+                memcmp(entry->input.data(), input, input_bytes) == 0) {
+                // move the entry to the front of the LRU list
+                entries.splice(entries.begin(), entries, entry);
+                memcpy(output, entry->output.data(), output_bytes);
+                hits++;
+                return;
+            }
+            // a hash collision, drop the old entry in favor of the new one
+            erase(entry);
+        }
+        misses++;
+        filter();
+        const std::size_t size = input_bytes + output_bytes + ENTRY_OVERHEAD;
+        if (size > budget) return;
+        while (bytes + size > budget) erase(std::prev(entries.end()));
+        const uint8_t* in = static_cast<const uint8_t*>(input);
+        const uint8_t* out = static_cast<const uint8_t*>(output);
+        entries.push_front(Entry{
+            key, burst,
+            std::vector<uint8_t>(in, in + input_bytes),
+            std::vector<uint8_t>(out, out + output_bytes)
+        });
+        index[key] = entries.begin();
+        bytes += size;
+    }
+
+ private:
+    /// the approximate bookkeeping cost of an entry in bytes
+    static const std::size_t ENTRY_OVERHEAD = 128;
+
+    /// an entry in the cache
+    struct Entry {
+        /// the key of the entry in the index
+        uint64_t key;
+        /// the burst phase of the row
+        int burst;
+        /// a copy of the input pixels of the row
+        std::vector<uint8_t> input;
+        /// the filtered output pixels of the row
+        std::vector<uint8_t> output;
+    };
+
+    /// the largest number of bytes the entries may occupy
+    uint64_t budget;
+    /// the number of bytes the entries occupy
+    uint64_t bytes = 0;
+    /// the generation of the kernel table
+    uint64_t generation = 0;
+    /// the entries ordered from most to least recently used
+    std::list<Entry> entries;
+    /// the entries keyed by their hash
+    std::unordered_map<uint64_t, std::list<Entry>::iterator> index;
+
+    /// @brief Remove an entry from the cache.
+    ///
+    /// @param entry the iterator of the entry to remove
+    ///
+    void erase(std::list<Entry>::iterator entry) {
+        bytes -= entry->input.size() + entry->output.size() + ENTRY_OVERHEAD;
+        index.erase(entry->key);
+        entries.erase(entry);
+    }
+
+    /// @brief Hash a row of pixels.
+    ///
+    /// @param data the bytes of the row
+    /// @param size the number of bytes in the row
+    /// @returns a 64-bit hash of the bytes
+    ///
+    static uint64_t hash(const void* data, std::size_t size) {
+        const uint8_t* row = static_cast<const uint8_t*>(data);
+        uint64_t value = 0xCBF29CE484222325ull ^ size;
+        std::size_t i = 0;
+        // mix the row a word at a time
+        for (; i + sizeof(uint64_t) <= size; i += sizeof(uint64_t)) {
+            uint64_t word;
+            memcpy(&word, row + i, sizeof(uint64_t));
+            value = (value ^ word) * 0x100000001B3ull;
+            value ^= value >> 29;
+        }
+        for (; i < size; i++)
+            value = (value ^ row[i]) * 0x100000001B3ull;
+        return value;
+    }
+};
+
+#endif  // ROW_CACHE_H_
@@ -0,0 +1,98 @@
+// Conversion of filtered scan lines to planar BT.601 YUV.
+// Copyright 2021 Christian Kauten
+//
+// Author: Christian Kauten (kautenja@auburn.edu)
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+
+#ifndef YUV_H_
+#define YUV_H_
+
+#include <cstdint>
+
+// The filters pack each output pixel as 0x00RRGGBB. These functions convert
+// rows of packed pixels to BT.601 limited-range YUV with the 8-bit integer
+// coefficients used by most video encoders, i.e., Y in [16, 235] and U, V in
+// [16, 240]. The constant terms add the offsets of the planes and the bias
+// that rounds to nearest, and keep the sums positive for the shifts.
+
+/// @brief Convert a row of packed RGB pixels to a row of the Y plane.
+///
+/// @param rgb the row of packed RGB pixels to read
+/// @param width the number of pixels in the row
+/// @param y the row of the Y plane to write
+///
+inline void yuv_luma_row(const uint32_t* rgb, uint32_t width, uint8_t* y) {
+    for (uint32_t x = 0; x < width; x++) {
+        const int r = (rgb[x] >> 16) & 0xFF;
+        const int g = (rgb[x] >> 8) & 0xFF;
+        const int b = rgb[x] & 0xFF;
+        y[x] = (66 * r + 129 * g + 25 * b + (16 << 8) + 128) >> 8;
+    }
+}
+
+/// @brief Convert a row of packed RGB pixels to rows of the U and V planes.
+///
+/// @param rgb the row of packed RGB pixels to read
+/// @param width the number of pixels in the row
+/// @param u the row of the U plane to write
+/// @param v the row of the V plane to write
+///
+inline void yuv_chroma_row(
+    const uint32_t* rgb,
+    uint32_t width,
+    uint8_t* u,
+    uint8_t* v
+) {
+    for (uint32_t x = 0; x < width; x++) {
+        const int r = (rgb[x] >> 16) & 0xFF;
+        const int g = (rgb[x] >> 8) & 0xFF;
+        const int b = rgb[x] & 0xFF;
+        u[x] = (-38 * r - 74 * g + 112 * b + (128 << 8) + 128) >> 8;
+        v[x] = (112 * r - 94 * g - 18 * b + (128 << 8) + 128) >> 8;
+    }
+}
+
+/// @brief Convert two rows of packed RGB pixels to subsampled rows of the
+/// U and V planes, i.e., a row of 4:2:0 chroma.
+///
+/// @param rgb0 the upper row of packed RGB pixels to read
+/// @param rgb1 the lower row of packed RGB pixels to read
+/// @param width the number of pixels in each row of packed RGB pixels
+/// @param u the row of the U plane to write with (width + 1) / 2 pixels
+/// @param v the row of the V plane to write with (width + 1) / 2 pixels
+///
+inline void yuv_chroma_rows_420(
+    const uint32_t* rgb0,
+    const uint32_t* rgb1,
+    uint32_t width,
+    uint8_t* u,
+    uint8_t* v
+) {
+    for (uint32_t x = 0; x < width; x += 2) {
+        // the last column of an odd width pairs with itself
+        const uint32_t x1 = x + 1 < width ? x + 1 : x;
+        // sum the channels of the 2x2 block of pixels
+        const int r = ((rgb0[x] >> 16) & 0xFF) + ((rgb0[x1] >> 16) & 0xFF)
+                    + ((rgb1[x] >> 16) & 0xFF) + ((rgb1[x1] >> 16) & 0xFF);
+        const int g = ((rgb0[x] >> 8) & 0xFF) + ((rgb0[x1] >> 8) & 0xFF)
+                    + ((rgb1[x] >> 8) & 0xFF) + ((rgb1[x1] >> 8) & 0xFF);
+        const int b = (rgb0[x] & 0xFF) + (rgb0[x1] & 0xFF)
+                    + (rgb1[x] & 0xFF) + (rgb1[x1] & 0xFF);
+        // the sums carry two extra bits, so shift by two more
+        u[x / 2] = (-38 * r - 74 * g + 112 * b + (128 << 10) + 512) >> 10;
+        v[x / 2] = (112 * r - 94 * g - 18 * b + (128 << 10) + 512) >> 10;
+    }
+}
+
+#endif  // YUV_H_
@@ -19,7 +19,13 @@
 #include <cstdint>
 #include <cstdlib>
 #include <cstdio>
+// `lib_nes_ntsc_emphasis.cpp` includes this file after `nes_ntsc_emphasis.h`
+// to build the library a second time for the 512-color palette
 #include "nes_ntsc.h"
+#include "nes_ntsc_fast.h"
+#include "preview.h"
+#include "row_cache.h"
+#include "yuv.h"
 #include "lib_ntsc.h"
 
 // definitions of functions for the Python interface to access
@@ -75,6 +81,22 @@ EXP nes_ntsc_t* NES_NTSC_InitializeConfiguration() {
 ///
 EXP void NES_NTSC_DestroyConfiguration(nes_ntsc_t* ntsc) { free(ntsc); }
 
+/// @brief Initialize a new `nes_ntsc_fast_t` and return a pointer to it.
+///
+/// @returns a pointer to the newly creating `nes_ntsc_fast_t` instance
+///
+EXP nes_ntsc_fast_t* NES_NTSC_InitializeFastConfiguration() {
+    return new nes_ntsc_fast_t;
+}
+
+/// @brief Destroy an existing instance of `nes_ntsc_fast_t`.
+///
+/// @param fast a pointer to an `nes_ntsc_fast_t` to free from memory
+///
+EXP void NES_NTSC_DestroyFastConfiguration(nes_ntsc_fast_t* fast) {
+    delete fast;
+}
+
 // -----------------------------------------------------------------------
 // MARK: Setup
 // -----------------------------------------------------------------------
@@ -134,6 +156,17 @@ EXP void NES_NTSC_SetupApply(nes_ntsc_t* ntsc, nes_ntsc_setup_t* setup) {
     nes_ntsc_init(ntsc, setup);
 }
 
+/// @brief Apply a configuration to the given instance of `nes_ntsc_fast_t`.
+///
+/// @param fast the instance of the fast filter to apply the configuration to
+/// @param ntsc the instance of the filter to copy the configuration from
+/// @returns an upper bound on the difference of any 8-bit output channel
+/// between the fast and the reference filter
+///
+EXP uint32_t NES_NTSC_SetupFast(nes_ntsc_fast_t* fast, nes_ntsc_t* ntsc) {
+    return nes_ntsc_fast_init(fast, ntsc);
+}
+
 // -----------------------------------------------------------------------
 // MARK: Pixel Buffers
 // -----------------------------------------------------------------------
@@ -143,19 +176,22 @@ EXP void NES_NTSC_SetupApply(nes_ntsc_t* ntsc, nes_ntsc_setup_t* setup) {
 /// @returns a pointer to the internal screen data structure as a vector
 /// representation of a matrix of height matching the visible scans lines and
 /// width matching the number of visible scan line dots. the data type is
-/// 8-bit NES pixel index corresponding to a value in the NES palettes
+/// `NES_NTSC_IN_T`, i.e., the 8-bit NES pixel index corresponding to a value
+/// in the NES palettes, or the 16-bit pixel with the 3 emphasis bits of the
+/// PPU mask register above the index when built by
+/// `lib_nes_ntsc_emphasis.cpp`
 ///
-EXP uint8_t* NES_NTSC_InitializeInputPixels() {
+EXP NES_NTSC_IN_T* NES_NTSC_InitializeInputPixels() {
     // calculate the total number of bytes in the pixel buffer
     static const uint32_t BYTES = NES_NTSC_HEIGHT() * NES_NTSC_WIDTH_INPUT();
-    return reinterpret_cast<uint8_t*>(calloc(BYTES, sizeof(uint8_t)));
+    return reinterpret_cast<NES_NTSC_IN_T*>(calloc(BYTES, sizeof(NES_NTSC_IN_T)));
 }
 
 /// @brief Free an input pixel buffer from memory.
 ///
 /// @param pixels the buffer of pixels to free from memory
 ///
-EXP void NES_NTSC_DestroyInputPixels(uint8_t* pixels) { free(pixels); }
+EXP void NES_NTSC_DestroyInputPixels(NES_NTSC_IN_T* pixels) { free(pixels); }
 
 /// @brief Initialize a tensor for the output pixels in RGBx format.
 ///
@@ -177,6 +213,107 @@ EXP void NES_NTSC_DestroyOutputPixels(uint32_t* pixels) { free(pixels); }
 // MARK: Processing
 // -----------------------------------------------------------------------
 
+/// @brief Filter a row of pixels, optionally through a row cache.
+///
+/// @param output the output row to write to
+/// @param input the input row to read NES pixels from
+/// @param ntsc the ntsc instance created by `NES_NTSC_InitializeConfiguration`
+/// @param fast the fast ntsc instance to filter with instead of `ntsc` if
+/// not null
+/// @param burst_phase the burst phase of the row
+/// @param cache the row cache to copy the row from or store it in if not null
+///
+static void NES_NTSC_ProcessRow(
+    uint32_t* const output,
+    const NES_NTSC_IN_T* const input,
+    const nes_ntsc_t* const ntsc,
+    const nes_ntsc_fast_t* const fast,
+    int burst_phase,
+    RowCache* const cache
+) {
+    auto filter = [&]() {
+        if (fast) {
+            nes_ntsc_fast_blit(
+                fast,                    // configured fast NTSC object
+                input,                   // input row of NES pixels
+                NES_NTSC_WIDTH_INPUT(),  // width of the NES screen
+                burst_phase,             // burst phase of the row
+                NES_NTSC_WIDTH_INPUT(),  // width of the NES screen
+                1,                       // a single row
+                output,                  // output row to write to
+                NES_NTSC_PITCH()         // number of bytes in an output row
+            );
+        } else {
+            nes_ntsc_blit(
+                ntsc,                    // configured NTSC object
+                input,                   // input row of NES pixels
+                NES_NTSC_WIDTH_INPUT(),  // width of the NES screen
+                burst_phase,             // burst phase of the row
+                NES_NTSC_WIDTH_INPUT(),  // width of the NES screen
+                1,                       // a single row
+                output,                  // output row to write to
+                NES_NTSC_PITCH()         // number of bytes in an output row
+            );
+        }
+    };
+    if (cache) {
+        static const uint32_t BYTES = NES_NTSC_WIDTH_INPUT() * sizeof(NES_NTSC_IN_T);
+        cache->blit(input, BYTES, burst_phase, output, NES_NTSC_PITCH(), filter);
+    } else {
+        filter();
+    }
+}
+
+/// @brief Filter every `step`-th output pixel of a row of pixels.
+///
+/// @param output the buffer to write a packed RGB pixel to per sampled pixel
+/// @param input the input row to read NES pixels from
+/// @param ntsc the ntsc instance created by `NES_NTSC_InitializeConfiguration`
+/// @param fast the fast ntsc instance to sample the coarsened kernel table of
+/// instead of `ntsc` if not null
+/// @param burst_phase the burst phase of the row
+/// @param step the number of output pixels to advance between sampled pixels
+///
+static void NES_NTSC_PreviewRow(
+    uint32_t* output,
+    const NES_NTSC_IN_T* const input,
+    const nes_ntsc_t* const ntsc,
+    const nes_ntsc_fast_t* const fast,
+    int burst_phase,
+    uint32_t step
+) {
+    if (fast) {  // sample the coarsened kernel table
+        nes_ntsc_fast_preview(fast, input, burst_phase, NES_NTSC_WIDTH_INPUT(), step, output);
+        return;
+    }
+    // offset the rows of the table to the burst phase of the scan line
+    const char* const ktable = reinterpret_cast<const char*>(ntsc->table[0]) +
+        burst_phase * (nes_ntsc_burst_size * sizeof(nes_ntsc_rgb_t));
+    const int WIDTH = NES_NTSC_WIDTH_INPUT();
+    for (uint32_t x = 0; x < NES_NTSC_WIDTH_OUTPUT(); x += step) {
+        int taps[6];
+        preview_taps(x, taps);
+        // lookup the kernels of the input pixels, black beyond the row
+        const nes_ntsc_rgb_t* kernels[6];
+        for (int kernel = 0; kernel < 6; kernel++) {
+            const int pixel = taps[kernel];
+            const unsigned color = pixel < 0 || pixel >= WIDTH ?
+                nes_ntsc_black : NES_NTSC_ADJ_IN(input[pixel]);
+            kernels[kernel] = NES_NTSC_ENTRY_(ktable, color);
+        }
+        // bind the kernels to the names that the output macro sums
+        const nes_ntsc_rgb_t* const kernel0 = kernels[0];
+        const nes_ntsc_rgb_t* const kernel1 = kernels[1];
+        const nes_ntsc_rgb_t* const kernel2 = kernels[2];
+        const nes_ntsc_rgb_t* const kernelx0 = kernels[3];
+        const nes_ntsc_rgb_t* const kernelx1 = kernels[4];
+        const nes_ntsc_rgb_t* const kernelx2 = kernels[5];
+        uint32_t rgb;
+        NES_NTSC_RGB_OUT(x % nes_ntsc_out_chunk, rgb, NES_NTSC_OUT_DEPTH);
+        *output++ = rgb;
+    }
+}
+
 /// @brief Process a step with the image filter.
 ///
 /// @param output_pixels the output pixel buffer to store into created by
@@ -189,7 +326,7 @@ EXP void NES_NTSC_DestroyOutputPixels(uint32_t* pixels) { free(pixels); }
 ///
 EXP void NES_NTSC_Process(
     uint32_t* const output_pixels,
-    const uint8_t* const input_pixels,
+    const NES_NTSC_IN_T* const input_pixels,
     const nes_ntsc_t* const ntsc,
     bool is_even_frame = false
 ) {
@@ -205,4 +342,217 @@ EXP void NES_NTSC_Process(
     );
 }
 
+/// @brief Process a step with the fast image filter.
+///
+/// @param output_pixels the output pixel buffer to store into created by
+/// `NES_NTSC_InitializeOutputPixels`
+/// @param input_pixels the input pixel buffer to read NES pixels from created
+/// by `NES_NTSC_InitializeInputPixels`
+/// @param fast the fast ntsc instance created by
+/// `NES_NTSC_InitializeFastConfiguration`
+/// @param is_even_frame whether this frame is even to emulate the flickering
+/// effect on every other frame
+///
+EXP void NES_NTSC_ProcessFast(
+    uint32_t* const output_pixels,
+    const NES_NTSC_IN_T* const input_pixels,
+    const nes_ntsc_fast_t* const fast,
+    bool is_even_frame = false
+) {
+    nes_ntsc_fast_blit(
+        fast,                    // configured fast NTSC object
+        input_pixels,            // input buffer of NES pixels
+        NES_NTSC_WIDTH_INPUT(),  // width of the NES screen
+        is_even_frame,           // alternating frame flag
+        NES_NTSC_WIDTH_INPUT(),  // width of the NES screen
+        NES_NTSC_HEIGHT(),       // height of the NES screen
+        output_pixels,           // output buffer to write to
+        NES_NTSC_PITCH()         // number of bytes in an output row
+    );
+}
+
+/// @brief Process a step with the image filter through a row cache.
+///
+/// @param output_pixels the output pixel buffer to store into created by
+/// `NES_NTSC_InitializeOutputPixels`
+/// @param input_pixels the input pixel buffer to read NES pixels from created
+/// by `NES_NTSC_InitializeInputPixels`
+/// @param ntsc the ntsc instance created by `NES_NTSC_InitializeConfiguration`
+/// @param fast the fast ntsc instance to filter with instead of `ntsc` if
+/// not null
+/// @param cache the row cache created by `NTSC_InitializeRowCache`
+/// @param is_even_frame whether this frame is even to emulate the flickering
+/// effect on every other frame
+///
+EXP void NES_NTSC_ProcessCached(
+    uint32_t* const output_pixels,
+    const NES_NTSC_IN_T* const input_pixels,
+    const nes_ntsc_t* const ntsc,
+    const nes_ntsc_fast_t* const fast,
+    RowCache* const cache,
+    bool is_even_frame = false
+) {
+    for (uint32_t y = 0; y < NES_NTSC_HEIGHT(); y++) {
+        // the burst phase advances by one for every row of the frame
+        int burst_phase = (is_even_frame + y) % nes_ntsc_burst_count;
+        NES_NTSC_ProcessRow(
+            output_pixels + y * NES_NTSC_WIDTH_OUTPUT(),
+            input_pixels + y * NES_NTSC_WIDTH_INPUT(),
+            ntsc, fast, burst_phase, cache
+        );
+    }
+}
+
+/// @brief Process a step with the image filter into planar YUV.
+///
+/// @param y_plane the Y plane to write with a byte per output pixel
+/// @param u_plane the U plane to write, subsampled by 2 in both dimensions
+/// if `subsample` is true
+/// @param v_plane the V plane to write, subsampled by 2 in both dimensions
+/// if `subsample` is true
+/// @param input_pixels the input pixel buffer to read NES pixels from created
+/// by `NES_NTSC_InitializeInputPixels`
+/// @param ntsc the ntsc instance created by `NES_NTSC_InitializeConfiguration`
+/// @param fast the fast ntsc instance to filter with instead of `ntsc` if
+/// not null
+/// @param cache the row cache to copy rows from and store rows in if not
+/// null
+/// @param subsample whether to write 4:2:0 chroma instead of 4:4:4 chroma
+/// @param is_even_frame whether this frame is even to emulate the flickering
+/// effect on every other frame
+///
+EXP void NES_NTSC_ProcessYUV(
+    uint8_t* const y_plane,
+    uint8_t* const u_plane,
+    uint8_t* const v_plane,
+    const NES_NTSC_IN_T* const input_pixels,
+    const nes_ntsc_t* const ntsc,
+    const nes_ntsc_fast_t* const fast,
+    RowCache* const cache,
+    bool subsample,
+    bool is_even_frame = false
+) {
+    static const uint32_t WIDTH = NES_NTSC_WIDTH_OUTPUT();
+    static const uint32_t HEIGHT = NES_NTSC_HEIGHT();
+    // the buffers for a pair of rows of filtered pixels
+    uint32_t rows[2][NES_NTSC_OUT_WIDTH(256)];
+    for (uint32_t y = 0; y < HEIGHT; y++) {
+        uint32_t* const row = rows[y % 2];
+        // the burst phase advances by one for every row of the frame
+        int burst_phase = (is_even_frame + y) % nes_ntsc_burst_count;
+        const NES_NTSC_IN_T* line_in = input_pixels + y * NES_NTSC_WIDTH_INPUT();
+        NES_NTSC_ProcessRow(row, line_in, ntsc, fast, burst_phase, cache);
+        yuv_luma_row(row, WIDTH, y_plane + y * WIDTH);
+        if (!subsample) {  // convert the chroma of every row
+            yuv_chroma_row(row, WIDTH, u_plane + y * WIDTH, v_plane + y * WIDTH);
+        } else if (y % 2 || y + 1 == HEIGHT) {
+            // convert the chroma of each pair of rows, the last row of an odd
+            // height pairs with itself
+            const uint32_t offset = (y / 2) * ((WIDTH + 1) / 2);
+            yuv_chroma_rows_420(rows[0], row, WIDTH, u_plane + offset, v_plane + offset);
+        }
+    }
+}
+
+/// @brief Process a step with the image filter into a reduced-size preview.
+///
+/// @param output_pixels the output buffer of 24-bit RGB pixels to store
+/// every `row_step`-th row of every `column_step`-th column into
+/// @param input_pixels the input pixel buffer to read NES pixels from created
+/// by `NES_NTSC_InitializeInputPixels`
+/// @param ntsc the ntsc instance created by `NES_NTSC_InitializeConfiguration`
+/// @param fast the fast ntsc instance to sample the coarsened kernel table of
+/// instead of `ntsc` if not null
+/// @param is_even_frame whether this frame is even to emulate the flickering
+/// effect on every other frame
+/// @param row_step the number of output rows to advance between sampled rows
+/// @param column_step the number of output columns to advance between
+/// sampled columns
+///
+EXP void NES_NTSC_ProcessPreview(
+    uint8_t* output_pixels,
+    const NES_NTSC_IN_T* const input_pixels,
+    const nes_ntsc_t* const ntsc,
+    const nes_ntsc_fast_t* const fast,
+    bool is_even_frame,
+    uint32_t row_step,
+    uint32_t column_step
+) {
+    // the buffer for the sampled pixels of a single row
+    uint32_t row[NES_NTSC_OUT_WIDTH(256)];
+    const uint32_t columns = preview_size(NES_NTSC_WIDTH_OUTPUT(), column_step);
+    // whether to filter whole rows, and the step between sampled columns in
+    // the row buffer
+    const bool is_whole = column_step < PREVIEW_SAMPLE_STEP;
+    const uint32_t stride = is_whole ? column_step : 1;
+    for (uint32_t y = 0; y < NES_NTSC_HEIGHT(); y += row_step) {
+        const NES_NTSC_IN_T* line_in = input_pixels + y * NES_NTSC_WIDTH_INPUT();
+        // the burst phase advances by one for every row of the frame
+        int burst_phase = (is_even_frame + y) % nes_ntsc_burst_count;
+        if (is_whole) {  // filter the whole row and skip columns
+            NES_NTSC_ProcessRow(row, line_in, ntsc, fast, burst_phase, nullptr);
+        } else {  // filter only the sampled columns
+            NES_NTSC_PreviewRow(row, line_in, ntsc, fast, burst_phase, column_step);
+        }
+        // pack the sampled columns as 24-bit RGB
+        for (uint32_t x = 0; x < columns; x++) {
+            *output_pixels++ = row[x * stride] >> 16;
+            *output_pixels++ = row[x * stride] >> 8;
+            *output_pixels++ = row[x * stride];
+        }
+    }
+}
+
+/// @brief Process a batch of frames with the image filter.
+///
+/// @param output_pixels the output buffer of 24-bit RGB pixels to store
+/// the cropped and downsampled frames into contiguously
+/// @param input_pixels the input buffer of contiguous frames to read NES
+/// pixels from
+/// @param ntsc the ntsc instance created by `NES_NTSC_InitializeConfiguration`
+/// @param fast the fast ntsc instance to filter with instead of `ntsc` if
+/// not null
+/// @param cache the row cache to copy rows from and store rows in if not
+/// null
+/// @param count the number of frames in the batch
+/// @param is_even_frame whether this frame is even to emulate the flickering
+/// effect on every other frame
+/// @param top the first output row to keep
+/// @param bottom the output row after the last output row to keep
+/// @param row_step the number of output rows to advance between kept rows
+/// @param left the first output column to keep
+/// @param right the output column after the last output column to keep
+/// @param column_step the number of output columns to advance between kept
+/// columns
+///
+EXP void NES_NTSC_ProcessBatch(
+    uint8_t* output_pixels,
+    const NES_NTSC_IN_T* input_pixels,
+    const nes_ntsc_t* const ntsc,
+    const nes_ntsc_fast_t* const fast,
+    RowCache* const cache,
+    uint32_t count,
+    bool is_even_frame,
+    uint32_t top, uint32_t bottom, uint32_t row_step,
+    uint32_t left, uint32_t right, uint32_t column_step
+) {
+    // the buffer for a single row of filtered pixels
+    uint32_t row[NES_NTSC_OUT_WIDTH(256)];
+    for (uint32_t frame = 0; frame < count; frame++) {
+        for (uint32_t y = top; y < bottom; y += row_step) {
+            const NES_NTSC_IN_T* line_in = input_pixels + y * NES_NTSC_WIDTH_INPUT();
+            // the burst phase advances by one for every row of the frame
+            int burst_phase = (is_even_frame + y) % nes_ntsc_burst_count;
+            NES_NTSC_ProcessRow(row, line_in, ntsc, fast, burst_phase, cache);
+            // pack the kept columns as 24-bit RGB
+            for (uint32_t x = left; x < right; x += column_step) {
+                *output_pixels++ = row[x] >> 16;
+                *output_pixels++ = row[x] >> 8;
+                *output_pixels++ = row[x];
+            }
+        }
+        input_pixels += NES_NTSC_HEIGHT() * NES_NTSC_WIDTH_INPUT();
+    }
+}
+
 }  // extern "C"
@@ -0,0 +1,49 @@
+// The library definition of the NES NTSC library with color emphasis.
+// Copyright 2021 Christian Kauten
+//
+// Author: Christian Kauten (kautenja@auburn.edu)
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+
+#include "nes_ntsc_emphasis.h"
+
+// rename the functions of the Python interface to the emphasis prefix
+#define NES_NTSC_HEIGHT NES_NTSC_EMPHASIS_HEIGHT
+#define NES_NTSC_WIDTH_INPUT NES_NTSC_EMPHASIS_WIDTH_INPUT
+#define NES_NTSC_WIDTH_OUTPUT NES_NTSC_EMPHASIS_WIDTH_OUTPUT
+#define NES_NTSC_PITCH NES_NTSC_EMPHASIS_PITCH
+#define NES_NTSC_InitializeConfiguration NES_NTSC_EMPHASIS_InitializeConfiguration
+#define NES_NTSC_DestroyConfiguration NES_NTSC_EMPHASIS_DestroyConfiguration
+#define NES_NTSC_InitializeFastConfiguration NES_NTSC_EMPHASIS_InitializeFastConfiguration
+#define NES_NTSC_DestroyFastConfiguration NES_NTSC_EMPHASIS_DestroyFastConfiguration
+#define NES_NTSC_InitializeSetup NES_NTSC_EMPHASIS_InitializeSetup
+#define NES_NTSC_DestroySetup NES_NTSC_EMPHASIS_DestroySetup
+#define NES_NTSC_SetupComposite NES_NTSC_EMPHASIS_SetupComposite
+#define NES_NTSC_SetupSVideo NES_NTSC_EMPHASIS_SetupSVideo
+#define NES_NTSC_SetupRGB NES_NTSC_EMPHASIS_SetupRGB
+#define NES_NTSC_SetupMonochrome NES_NTSC_EMPHASIS_SetupMonochrome
+#define NES_NTSC_SetupApply NES_NTSC_EMPHASIS_SetupApply
+#define NES_NTSC_SetupFast NES_NTSC_EMPHASIS_SetupFast
+#define NES_NTSC_InitializeInputPixels NES_NTSC_EMPHASIS_InitializeInputPixels
+#define NES_NTSC_DestroyInputPixels NES_NTSC_EMPHASIS_DestroyInputPixels
+#define NES_NTSC_InitializeOutputPixels NES_NTSC_EMPHASIS_InitializeOutputPixels
+#define NES_NTSC_DestroyOutputPixels NES_NTSC_EMPHASIS_DestroyOutputPixels
+#define NES_NTSC_Process NES_NTSC_EMPHASIS_Process
+#define NES_NTSC_ProcessFast NES_NTSC_EMPHASIS_ProcessFast
+#define NES_NTSC_ProcessCached NES_NTSC_EMPHASIS_ProcessCached
+#define NES_NTSC_ProcessYUV NES_NTSC_EMPHASIS_ProcessYUV
+#define NES_NTSC_ProcessPreview NES_NTSC_EMPHASIS_ProcessPreview
+#define NES_NTSC_ProcessBatch NES_NTSC_EMPHASIS_ProcessBatch
+
+// compile the library a second time with the emphasis configuration
+#include "lib_nes_ntsc.cpp"
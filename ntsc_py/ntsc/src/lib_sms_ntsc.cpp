@@ -20,6 +20,9 @@
 #include <cstdlib>
 #include <cstdio>
 #include "sms_ntsc.h"
+#include "preview.h"
+#include "row_cache.h"
+#include "yuv.h"
 #include "lib_ntsc.h"
 
 // definitions of functions for the Python interface to access
@@ -177,6 +180,76 @@ EXP void SMS_NTSC_DestroyOutputPixels(uint32_t* pixels) { free(pixels); }
 // MARK: Processing
 // -----------------------------------------------------------------------
 
+/// @brief Filter a row of pixels, optionally through a row cache.
+///
+/// @param output the output row to write to
+/// @param input the input row to read SMS pixels from
+/// @param ntsc the ntsc instance created by `SMS_NTSC_InitializeConfiguration`
+/// @param cache the row cache to copy the row from or store it in if not null
+///
+static void SMS_NTSC_ProcessRow(
+    uint32_t* const output,
+    const uint16_t* const input,
+    const sms_ntsc_t* const ntsc,
+    RowCache* const cache
+) {
+    auto filter = [&]() {
+        sms_ntsc_blit(
+            ntsc,                    // configured NTSC object
+            input,                   // input row of SMS pixels
+            SMS_NTSC_WIDTH_INPUT(),  // width of the SMS screen
+            SMS_NTSC_WIDTH_INPUT(),  // width of the SMS screen
+            1,                       // a single row
+            output,                  // output row to write to
+            SMS_NTSC_PITCH()         // number of bytes in an output row
+        );
+    };
+    if (cache) {
+        static const uint32_t BYTES = SMS_NTSC_WIDTH_INPUT() * sizeof(uint16_t);
+        cache->blit(input, BYTES, 0, output, SMS_NTSC_PITCH(), filter);
+    } else {
+        filter();
+    }
+}
+
+/// @brief Filter every `step`-th output pixel of a row of pixels.
+///
+/// @param output the buffer to write a packed RGB pixel to per sampled pixel
+/// @param input the input row to read SMS pixels from
+/// @param ntsc the ntsc instance created by `SMS_NTSC_InitializeConfiguration`
+/// @param step the number of output pixels to advance between sampled pixels
+///
+static void SMS_NTSC_PreviewRow(
+    uint32_t* output,
+    const uint16_t* const input,
+    const sms_ntsc_t* const ntsc,
+    uint32_t step
+) {
+    const int WIDTH = SMS_NTSC_WIDTH_INPUT();
+    for (uint32_t x = 0; x < SMS_NTSC_WIDTH_OUTPUT(); x += step) {
+        int taps[6];
+        preview_taps(x, taps);
+        // lookup the kernels of the input pixels, black beyond the row
+        const sms_ntsc_rgb_t* kernels[6];
+        for (int kernel = 0; kernel < 6; kernel++) {
+            const int pixel = taps[kernel];
+            const unsigned color = pixel < 0 || pixel >= WIDTH ?
+                sms_ntsc_black : SMS_NTSC_ADJ_IN(input[pixel]);
+            kernels[kernel] = SMS_NTSC_IN_FORMAT(ntsc, color);
+        }
+        // bind the kernels to the names that the output macro sums
+        const sms_ntsc_rgb_t* const kernel0 = kernels[0];
+        const sms_ntsc_rgb_t* const kernel1 = kernels[1];
+        const sms_ntsc_rgb_t* const kernel2 = kernels[2];
+        const sms_ntsc_rgb_t* const kernelx0 = kernels[3];
+        const sms_ntsc_rgb_t* const kernelx1 = kernels[4];
+        const sms_ntsc_rgb_t* const kernelx2 = kernels[5];
+        uint32_t rgb;
+        SMS_NTSC_RGB_OUT(x % sms_ntsc_out_chunk, rgb, SMS_NTSC_OUT_DEPTH);
+        *output++ = rgb;
+    }
+}
+
 /// @brief Process a step with the image filter.
 ///
 /// @param output_pixels the output pixel buffer to store into created by
@@ -201,4 +274,156 @@ EXP void SMS_NTSC_Process(
     );
 }
 
+/// @brief Process a step with the image filter through a row cache.
+///
+/// @param output_pixels the output pixel buffer to store into created by
+/// `SMS_NTSC_InitializeOutputPixels`
+/// @param input_pixels the input pixel buffer to read SMS pixels from created
+/// by `SMS_NTSC_InitializeInputPixels`
+/// @param ntsc the ntsc instance created by `SMS_NTSC_InitializeConfiguration`
+/// @param cache the row cache created by `NTSC_InitializeRowCache`
+///
+EXP void SMS_NTSC_ProcessCached(
+    uint32_t* const output_pixels,
+    const uint16_t* const input_pixels,
+    const sms_ntsc_t* const ntsc,
+    RowCache* const cache
+) {
+    for (uint32_t y = 0; y < SMS_NTSC_HEIGHT(); y++) {
+        SMS_NTSC_ProcessRow(
+            output_pixels + y * SMS_NTSC_WIDTH_OUTPUT(),
+            input_pixels + y * SMS_NTSC_WIDTH_INPUT(),
+            ntsc, cache
+        );
+    }
+}
+
+/// @brief Process a step with the image filter into planar YUV.
+///
+/// @param y_plane the Y plane to write with a byte per output pixel
+/// @param u_plane the U plane to write, subsampled by 2 in both dimensions
+/// if `subsample` is true
+/// @param v_plane the V plane to write, subsampled by 2 in both dimensions
+/// if `subsample` is true
+/// @param input_pixels the input pixel buffer to read SMS pixels from created
+/// by `SMS_NTSC_InitializeInputPixels`
+/// @param ntsc the ntsc instance created by `SMS_NTSC_InitializeConfiguration`
+/// @param cache the row cache to copy rows from and store rows in if not
+/// null
+/// @param subsample whether to write 4:2:0 chroma instead of 4:4:4 chroma
+///
+EXP void SMS_NTSC_ProcessYUV(
+    uint8_t* const y_plane,
+    uint8_t* const u_plane,
+    uint8_t* const v_plane,
+    const uint16_t* const input_pixels,
+    const sms_ntsc_t* const ntsc,
+    RowCache* const cache,
+    bool subsample
+) {
+    static const uint32_t WIDTH = SMS_NTSC_WIDTH_OUTPUT();
+    static const uint32_t HEIGHT = SMS_NTSC_HEIGHT();
+    // the buffers for a pair of rows of filtered pixels
+    uint32_t rows[2][SMS_NTSC_OUT_WIDTH(256)];
+    for (uint32_t y = 0; y < HEIGHT; y++) {
+        uint32_t* const row = rows[y % 2];
+        const uint16_t* line_in = input_pixels + y * SMS_NTSC_WIDTH_INPUT();
+        SMS_NTSC_ProcessRow(row, line_in, ntsc, cache);
+        yuv_luma_row(row, WIDTH, y_plane + y * WIDTH);
+        if (!subsample) {  // convert the chroma of every row
+            yuv_chroma_row(row, WIDTH, u_plane + y * WIDTH, v_plane + y * WIDTH);
+        } else if (y % 2 || y + 1 == HEIGHT) {
+            // convert the chroma of each pair of rows, the last row of an odd
+            // height pairs with itself
+            const uint32_t offset = (y / 2) * ((WIDTH + 1) / 2);
+            yuv_chroma_rows_420(rows[0], row, WIDTH, u_plane + offset, v_plane + offset);
+        }
+    }
+}
+
+/// @brief Process a step with the image filter into a reduced-size preview.
+///
+/// @param output_pixels the output buffer of 24-bit RGB pixels to store
+/// every `row_step`-th row of every `column_step`-th column into
+/// @param input_pixels the input pixel buffer to read SMS pixels from created
+/// by `SMS_NTSC_InitializeInputPixels`
+/// @param ntsc the ntsc instance created by `SMS_NTSC_InitializeConfiguration`
+/// @param row_step the number of output rows to advance between sampled rows
+/// @param column_step the number of output columns to advance between
+/// sampled columns
+///
+EXP void SMS_NTSC_ProcessPreview(
+    uint8_t* output_pixels,
+    const uint16_t* const input_pixels,
+    const sms_ntsc_t* const ntsc,
+    uint32_t row_step,
+    uint32_t column_step
+) {
+    // the buffer for the sampled pixels of a single row
+    uint32_t row[SMS_NTSC_OUT_WIDTH(256)];
+    const uint32_t columns = preview_size(SMS_NTSC_WIDTH_OUTPUT(), column_step);
+    // whether to filter whole rows, and the step between sampled columns in
+    // the row buffer
+    const bool is_whole = column_step < PREVIEW_SAMPLE_STEP;
+    const uint32_t stride = is_whole ? column_step : 1;
+    for (uint32_t y = 0; y < SMS_NTSC_HEIGHT(); y += row_step) {
+        const uint16_t* line_in = input_pixels + y * SMS_NTSC_WIDTH_INPUT();
+        if (is_whole) {  // filter the whole row and skip columns
+            SMS_NTSC_ProcessRow(row, line_in, ntsc, nullptr);
+        } else {  // filter only the sampled columns
+            SMS_NTSC_PreviewRow(row, line_in, ntsc, column_step);
+        }
+        // pack the sampled columns as 24-bit RGB
+        for (uint32_t x = 0; x < columns; x++) {
+            *output_pixels++ = row[x * stride] >> 16;
+            *output_pixels++ = row[x * stride] >> 8;
+            *output_pixels++ = row[x * stride];
+        }
+    }
+}
+
+/// @brief Process a batch of frames with the image filter.
+///
+/// @param output_pixels the output buffer of 24-bit RGB pixels to store
+/// the cropped and downsampled frames into contiguously
+/// @param input_pixels the input buffer of contiguous frames to read SMS
+/// pixels from
+/// @param ntsc the ntsc instance created by `SMS_NTSC_InitializeConfiguration`
+/// @param cache the row cache to copy rows from and store rows in if not
+/// null
+/// @param count the number of frames in the batch
+/// @param top the first output row to keep
+/// @param bottom the output row after the last output row to keep
+/// @param row_step the number of output rows to advance between kept rows
+/// @param left the first output column to keep
+/// @param right the output column after the last output column to keep
+/// @param column_step the number of output columns to advance between kept
+/// columns
+///
+EXP void SMS_NTSC_ProcessBatch(
+    uint8_t* output_pixels,
+    const uint16_t* input_pixels,
+    const sms_ntsc_t* const ntsc,
+    RowCache* const cache,
+    uint32_t count,
+    uint32_t top, uint32_t bottom, uint32_t row_step,
+    uint32_t left, uint32_t right, uint32_t column_step
+) {
+    // the buffer for a single row of filtered pixels
+    uint32_t row[SMS_NTSC_OUT_WIDTH(256)];
+    for (uint32_t frame = 0; frame < count; frame++) {
+        for (uint32_t y = top; y < bottom; y += row_step) {
+            const uint16_t* line_in = input_pixels + y * SMS_NTSC_WIDTH_INPUT();
+            SMS_NTSC_ProcessRow(row, line_in, ntsc, cache);
+            // pack the kept columns as 24-bit RGB
+            for (uint32_t x = left; x < right; x += column_step) {
+                *output_pixels++ = row[x] >> 16;
+                *output_pixels++ = row[x] >> 8;
+                *output_pixels++ = row[x];
+            }
+        }
+        input_pixels += SMS_NTSC_HEIGHT() * SMS_NTSC_WIDTH_INPUT();
+    }
+}
+
 }  // extern "C"
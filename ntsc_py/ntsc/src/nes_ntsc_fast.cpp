@@ -0,0 +1,265 @@
+// A reduced NES NTSC blitter for configurations without artifacts.
+// Copyright 2021 Christian Kauten
+//
+// Author: Christian Kauten (kautenja@auburn.edu)
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+
+#include <algorithm>
+#include "nes_ntsc_fast.h"
+#include "preview.h"
+
+/// the bias that centers each packed 10-bit channel on zero
+static const uint32_t FAST_BIAS = 512 * nes_ntsc_rgb_builder;
+
+/// @brief Unpack the signed per-channel difference between two entries.
+///
+/// @param a the entry to subtract from
+/// @param b the entry to subtract
+/// @param out the array of 3 channels (R, G, B) to write the difference to
+///
+static inline void unpack_difference(uint32_t a, uint32_t b, int* out) {
+    uint32_t packed = a - b + FAST_BIAS;
+    out[0] = static_cast<int>(packed >> 21 & 0x3FF) - 512;
+    out[1] = static_cast<int>(packed >> 11 & 0x3FF) - 512;
+    out[2] = static_cast<int>(packed >>  1 & 0x3FF) - 512;
+}
+
+/// the kernels (0, 1, 2, x0, x1, x2) that the fast blitter evaluates for
+/// each output pixel in a chunk, i.e., the three largest for the RGB preset
+static constexpr bool KEPT[nes_ntsc_out_chunk][6] = {
+    {0, 1, 0, 1, 0, 1},
+    {0, 1, 1, 1, 0, 0},
+    {0, 0, 1, 1, 1, 0},
+    {1, 0, 1, 0, 1, 0},
+    {1, 0, 0, 0, 1, 1},
+    {1, 1, 0, 0, 0, 1},
+    {1, 1, 0, 0, 0, 1},
+};
+
+/// @brief Return the entry of a kernel that contributes to an output pixel.
+///
+/// @param x the index of the output pixel in the chunk
+/// @param kernel the index of the kernel (0, 1, 2, x0, x1, x2)
+/// @returns the index of the entry in the burst phase of the kernel
+///
+static constexpr int entry_of(int x, int kernel) {
+    return kernel == 0 ? x :
+        kernel == 1 ? (x + 12) % 7 + 14 :
+        kernel == 2 ? (x + 10) % 7 + 28 :
+        kernel == 3 ? (x + 7) % 14 :
+        kernel == 4 ? (x + 5) % 7 + 21 :
+        (x + 3) % 7 + 35;
+}
+
+/// the bound on the output error when the packed sums may leave the range of
+/// `NES_NTSC_CLAMP_`, i.e., when the fast output is unbounded
+static const uint32_t FAST_UNBOUNDED = 255;
+
+/// the margin of the range of `NES_NTSC_CLAMP_` for carries out of bit 0
+static const int CLAMP_MARGIN = 4;
+
+/// @brief Return whether a channel sum stays in the range of the clamp.
+///
+/// @param low the smallest signed channel sum of an output pixel
+/// @param high the largest signed channel sum of an output pixel
+/// @returns true if `NES_NTSC_CLAMP_` saturates every sum in the range
+///
+static inline bool is_clamped(int low, int high) {
+    // the clamp detects a channel from -256 to 511 and wraps beyond it
+    return low >= -256 + CLAMP_MARGIN && high < 512 - CLAMP_MARGIN;
+}
+
+uint32_t nes_ntsc_fast_init(nes_ntsc_fast_t* fast, const nes_ntsc_t* ntsc) {
+    for (int color = 0; color < nes_ntsc_palette_size; color++)
+        for (int entry = 0; entry < nes_ntsc_entry_size; entry++)
+            fast->table[color][entry] = ntsc->table[color][entry];
+    uint32_t bound = 0;
+    bool is_bounded = true;
+    for (int x = 0; x < nes_ntsc_out_chunk; x++) {
+        // the entry of the first kept kernel absorbs the dropped kernels
+        int first = 0;
+        while (!KEPT[x][first]) first++;
+        uint32_t error = 0;
+        for (int burst = 0; burst < nes_ntsc_burst_count; burst++) {
+            const int offset = burst * nes_ntsc_burst_size;
+            // the signed channels of the output pixel for a row of black
+            uint32_t black_sum = 0;
+            for (int kernel = 0; kernel < 6; kernel++)
+                black_sum += ntsc->table[nes_ntsc_black][offset + entry_of(x, kernel)];
+            int black[3];
+            unpack_difference(black_sum, FAST_BIAS, black);
+            // the range of the channel sums of the reference and fast pixel
+            int low[3] = {black[0], black[1], black[2]};
+            int high[3] = {black[0], black[1], black[2]};
+            int fast_low[3] = {black[0], black[1], black[2]};
+            int fast_high[3] = {black[0], black[1], black[2]};
+            uint32_t dropped = 0;
+            for (int kernel = 0; kernel < 6; kernel++) {
+                const int entry = offset + entry_of(x, kernel);
+                const uint32_t black_entry = ntsc->table[nes_ntsc_black][entry];
+                // the range of changes of the entry from that of black
+                int smallest[3] = {0, 0, 0};
+                int largest[3] = {0, 0, 0};
+                for (int color = 0; color < nes_ntsc_palette_size; color++) {
+                    int difference[3];
+                    unpack_difference(ntsc->table[color][entry], black_entry, difference);
+                    for (int channel = 0; channel < 3; channel++) {
+                        if (difference[channel] < smallest[channel]) smallest[channel] = difference[channel];
+                        if (difference[channel] > largest[channel]) largest[channel] = difference[channel];
+                    }
+                    if (!KEPT[x][kernel])
+                        fast->table[color][offset + entry_of(x, first)] += black_entry;
+                }
+                int change = 0;
+                for (int channel = 0; channel < 3; channel++) {
+                    low[channel] += smallest[channel];
+                    high[channel] += largest[channel];
+                    if (KEPT[x][kernel]) {
+                        fast_low[channel] += smallest[channel];
+                        fast_high[channel] += largest[channel];
+                    } else {
+                        change = std::max(change, std::max(-smallest[channel], largest[channel]));
+                    }
+                }
+                dropped += change;
+            }
+            // the clamp bounds the error only if it saturates both sums
+            for (int channel = 0; channel < 3; channel++) {
+                is_bounded &= is_clamped(low[channel], high[channel]);
+                is_bounded &= is_clamped(fast_low[channel], fast_high[channel]);
+            }
+            if (dropped > error) error = dropped;
+        }
+        if (error > bound) bound = error;
+    }
+    return is_bounded ? std::min(bound, FAST_UNBOUNDED) : FAST_UNBOUNDED;
+}
+
+/// @brief Generate an output pixel from the kept kernels of the fast table.
+///
+/// @details
+/// This mirrors `NES_NTSC_RGB_OUT_14_` with 32-bit kernel entries.
+///
+#define NES_NTSC_FAST_OUT(x, rgb_out) {\
+    uint32_t raw_ = 0;\
+    if (KEPT[x][0]) raw_ += kernel0 [entry_of(x, 0)];\
+    if (KEPT[x][1]) raw_ += kernel1 [entry_of(x, 1)];\
+    if (KEPT[x][2]) raw_ += kernel2 [entry_of(x, 2)];\
+    if (KEPT[x][3]) raw_ += kernelx0[entry_of(x, 3)];\
+    if (KEPT[x][4]) raw_ += kernelx1[entry_of(x, 4)];\
+    if (KEPT[x][5]) raw_ += kernelx2[entry_of(x, 5)];\
+    NES_NTSC_CLAMP_(raw_, 0);\
+    NES_NTSC_RGB_OUT_(rgb_out, NES_NTSC_OUT_DEPTH, 0);\
+}
+
+/// @brief Begin an input pixel with the fast table.
+#define NES_NTSC_FAST_IN(index, color) {\
+    kernelx##index = kernel##index;\
+    kernel##index = ktable[color];\
+}
+
+void nes_ntsc_fast_blit(
+    const nes_ntsc_fast_t* fast,
+    const NES_NTSC_IN_T* input,
+    long in_row_width,
+    int burst_phase,
+    int in_width,
+    int in_height,
+    void* rgb_out,
+    long out_pitch
+) {
+    const int chunk_count = (in_width - 1) / nes_ntsc_in_chunk;
+    for (; in_height; --in_height) {
+        // offset the rows of the table to the burst phase of the scan line
+        typedef const uint32_t (*table_t)[nes_ntsc_entry_size];
+        table_t ktable = reinterpret_cast<table_t>(&fast->table[0][burst_phase * nes_ntsc_burst_size]);
+        const NES_NTSC_IN_T* line_in = input;
+        uint32_t* __restrict__ line_out = static_cast<uint32_t*>(rgb_out);
+        const uint32_t* kernel0 = ktable[nes_ntsc_black];
+        const uint32_t* kernel1 = ktable[nes_ntsc_black];
+        const uint32_t* kernel2 = ktable[NES_NTSC_ADJ_IN(*line_in)];
+        const uint32_t* kernelx0 = kernel0;
+        const uint32_t* kernelx1 = kernel0;
+        const uint32_t* kernelx2 = kernel0;
+        ++line_in;
+
+        for (int n = chunk_count; n; --n) {
+            // order of input and output pixels must not be altered
+            NES_NTSC_FAST_IN(0, NES_NTSC_ADJ_IN(line_in[0]));
+            NES_NTSC_FAST_OUT(0, line_out[0]);
+            NES_NTSC_FAST_OUT(1, line_out[1]);
+
+            NES_NTSC_FAST_IN(1, NES_NTSC_ADJ_IN(line_in[1]));
+            NES_NTSC_FAST_OUT(2, line_out[2]);
+            NES_NTSC_FAST_OUT(3, line_out[3]);
+
+            NES_NTSC_FAST_IN(2, NES_NTSC_ADJ_IN(line_in[2]));
+            NES_NTSC_FAST_OUT(4, line_out[4]);
+            NES_NTSC_FAST_OUT(5, line_out[5]);
+            NES_NTSC_FAST_OUT(6, line_out[6]);
+
+            line_in  += 3;
+            line_out += 7;
+        }
+
+        // finish final pixels
+        NES_NTSC_FAST_IN(0, nes_ntsc_black);
+        NES_NTSC_FAST_OUT(0, line_out[0]);
+        NES_NTSC_FAST_OUT(1, line_out[1]);
+
+        NES_NTSC_FAST_IN(1, nes_ntsc_black);
+        NES_NTSC_FAST_OUT(2, line_out[2]);
+        NES_NTSC_FAST_OUT(3, line_out[3]);
+
+        NES_NTSC_FAST_IN(2, nes_ntsc_black);
+        NES_NTSC_FAST_OUT(4, line_out[4]);
+        NES_NTSC_FAST_OUT(5, line_out[5]);
+        NES_NTSC_FAST_OUT(6, line_out[6]);
+
+        burst_phase = (burst_phase + 1) % nes_ntsc_burst_count;
+        input += in_row_width;
+        rgb_out = static_cast<char*>(rgb_out) + out_pitch;
+    }
+}
+
+void nes_ntsc_fast_preview(
+    const nes_ntsc_fast_t* fast,
+    const NES_NTSC_IN_T* input,
+    int burst_phase,
+    int in_width,
+    uint32_t step,
+    uint32_t* rgb_out
+) {
+    // offset the rows of the table to the burst phase of the scan line
+    typedef const uint32_t (*table_t)[nes_ntsc_entry_size];
+    table_t ktable = reinterpret_cast<table_t>(&fast->table[0][burst_phase * nes_ntsc_burst_size]);
+    const uint32_t out_width = NES_NTSC_OUT_WIDTH(in_width);
+    for (uint32_t x = 0; x < out_width; x += step) {
+        int taps[6];
+        preview_taps(x, taps);
+        const int index = x % nes_ntsc_out_chunk;
+        uint32_t raw_ = 0;
+        for (int kernel = 0; kernel < 6; kernel++) {
+            if (!KEPT[index][kernel]) continue;
+            const int pixel = taps[kernel];
+            const int color = pixel < 0 || pixel >= in_width ?
+                nes_ntsc_black : NES_NTSC_ADJ_IN(input[pixel]);
+            raw_ += ktable[color][entry_of(index, kernel)];
+        }
+        NES_NTSC_CLAMP_(raw_, 0);
+        uint32_t rgb;
+        NES_NTSC_RGB_OUT_(rgb, NES_NTSC_OUT_DEPTH, 0);
+        *rgb_out++ = rgb;
+    }
+}
@@ -0,0 +1,60 @@
+// The library definition of the row cache.
+// Copyright 2021 Christian Kauten
+//
+// Author: Christian Kauten (kautenja@auburn.edu)
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <http://www.gnu.org/licenses/>.
+//
+
+#include <cstdint>
+#include "row_cache.h"
+#include "lib_ntsc.h"
+
+// definitions of functions for the Python interface to access
+extern "C" {
+
+/// @brief Initialize a new `RowCache` and return a pointer to it.
+///
+/// @param budget the largest number of bytes the cached rows may occupy
+/// @returns a pointer to the newly creating `RowCache` instance
+///
+EXP RowCache* NTSC_InitializeRowCache(uint64_t budget) {
+    return new RowCache(budget);
+}
+
+/// @brief Destroy an existing instance of `RowCache`.
+///
+/// @param cache a pointer to a `RowCache` to free from memory
+///
+EXP void NTSC_DestroyRowCache(RowCache* cache) { delete cache; }
+
+/// @brief Drop every row from the cache, e.g., after the setup changes.
+///
+/// @param cache the cache to clear
+///
+EXP void NTSC_RowCacheClear(RowCache* cache) { cache->clear(); }
+
+/// @brief Return the number of rows that were copied from the cache.
+///
+/// @param cache the cache to return the hits of
+/// @returns the number of hits since the cache was created
+///
+EXP uint64_t NTSC_RowCacheHits(RowCache* cache) { return cache->hits; }
+
+/// @brief Return the number of rows that were filtered by the cache.
+///
+/// @param cache the cache to return the misses of
+/// @returns the number of misses since the cache was created
+///
+EXP uint64_t NTSC_RowCacheMisses(RowCache* cache) { return cache->misses; }
+
+}  // extern "C"
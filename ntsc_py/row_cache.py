@@ -0,0 +1,63 @@
+"""A CTypes interface to the least-recently-used cache of filtered rows."""
+import ctypes
+from ._library import LIBRARY
+
+
+# setup the argument and return types for NTSC_InitializeRowCache
+LIBRARY.NTSC_InitializeRowCache.argtypes = [ctypes.c_uint64]
+LIBRARY.NTSC_InitializeRowCache.restype = ctypes.c_void_p
+# setup the argument and return types for NTSC_DestroyRowCache
+LIBRARY.NTSC_DestroyRowCache.argtypes = [ctypes.c_void_p]
+LIBRARY.NTSC_DestroyRowCache.restype = None
+# setup the argument and return types for NTSC_RowCacheClear
+LIBRARY.NTSC_RowCacheClear.argtypes = [ctypes.c_void_p]
+LIBRARY.NTSC_RowCacheClear.restype = None
+# setup the argument and return types for NTSC_RowCacheHits
+LIBRARY.NTSC_RowCacheHits.argtypes = [ctypes.c_void_p]
+LIBRARY.NTSC_RowCacheHits.restype = ctypes.c_uint64
+# setup the argument and return types for NTSC_RowCacheMisses
+LIBRARY.NTSC_RowCacheMisses.argtypes = [ctypes.c_void_p]
+LIBRARY.NTSC_RowCacheMisses.restype = ctypes.c_uint64
+
+
+class RowCache:
+    """A least-recently-used cache of filtered rows keyed on their content."""
+
+    def __init__(self, size):
+        """
+        Initialize a new RowCache.
+
+        Args:
+            size: the largest number of bytes the cached rows may occupy
+
+        Returns:
+            None
+
+        """
+        self._cache = None
+        if size < 0:
+            raise ValueError(f'size should be non-negative, but received {repr(size)}')
+        self._cache = LIBRARY.NTSC_InitializeRowCache(size)
+
+    def __del__(self):
+        """Delete an instance of RowCache."""
+        if self._cache is not None:
+            LIBRARY.NTSC_DestroyRowCache(self._cache)
+
+    @property
+    def hits(self):
+        """Return the number of rows that were copied from the cache."""
+        return LIBRARY.NTSC_RowCacheHits(self._cache)
+
+    @property
+    def misses(self):
+        """Return the number of rows that were filtered and cached."""
+        return LIBRARY.NTSC_RowCacheMisses(self._cache)
+
+    def clear(self):
+        """Drop every cached row, e.g., after the kernel table changes."""
+        LIBRARY.NTSC_RowCacheClear(self._cache)
+
+
+# explicitly define the outward facing API of this module
+__all__ = [RowCache.__name__]
@@ -1,7 +1,8 @@
 """A CTypes interface to Blargg's C++ SMS NTSC filter."""
 import ctypes
 from ._library import LIBRARY
-from .utility import ndarray_from_byte_buffer
+from .row_cache import RowCache
+from .utility import ndarray_from_byte_buffer, preview_output, yuv_subsampling
 
 
 # setup the argument and return types for SMS_NTSC_HEIGHT
@@ -91,17 +92,33 @@ LIBRARY.SMS_NTSC_DestroyOutputPixels.restype = None
 # setup the argument and return types for SMS_NTSC_Process
 LIBRARY.SMS_NTSC_Process.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.POINTER(sms_ntsc_t)]
 LIBRARY.SMS_NTSC_Process.restype = None
+# setup the argument and return types for SMS_NTSC_ProcessCached
+LIBRARY.SMS_NTSC_ProcessCached.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.POINTER(sms_ntsc_t), ctypes.c_void_p]
+LIBRARY.SMS_NTSC_ProcessCached.restype = None
+# setup the argument and return types for SMS_NTSC_ProcessYUV
+LIBRARY.SMS_NTSC_ProcessYUV.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.POINTER(sms_ntsc_t), ctypes.c_void_p, ctypes.c_bool]
+LIBRARY.SMS_NTSC_ProcessYUV.restype = None
+# setup the argument and return types for SMS_NTSC_ProcessPreview
+LIBRARY.SMS_NTSC_ProcessPreview.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.POINTER(sms_ntsc_t), ctypes.c_uint, ctypes.c_uint]
+LIBRARY.SMS_NTSC_ProcessPreview.restype = None
+# setup the argument and return types for SMS_NTSC_ProcessBatch
+LIBRARY.SMS_NTSC_ProcessBatch.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.POINTER(sms_ntsc_t), ctypes.c_void_p, ctypes.c_uint, *[ctypes.c_uint] * 6]
+LIBRARY.SMS_NTSC_ProcessBatch.restype = None
 
 
 class SMS_NTSC:
     """A graphical filter that models the Sega Master System."""
 
-    def __init__(self, mode='rgb', **kwargs):
+    def __init__(self, mode='rgb', cache_size=None, **kwargs):
         """
         Initialize a new SMS_NTSC graphical filter.
 
         Args:
             mode: the video mode to initialize the filter with
+            cache_size: the number of bytes to cache filtered rows in, or None
+                to disable the cache. rows that repeat from frame to frame, like
+                static backgrounds and borders, are copied from the cache
+                instead of being filtered again
             **kwargs: the keyword arguments to pass to the setup structure
 
         Returns:
@@ -121,6 +138,8 @@ class SMS_NTSC:
         )
         shape_output = LIBRARY.SMS_NTSC_HEIGHT(), LIBRARY.SMS_NTSC_WIDTH_OUTPUT(), 4
         self.output = ndarray_from_byte_buffer(self._output, shape_output)[:, :, 1:]
+        # setup the cache of filtered rows
+        self.cache = None if cache_size is None else RowCache(cache_size)
         # setup the mode
         self.setup(mode=mode, **kwargs)
 
@@ -160,10 +179,77 @@ class SMS_NTSC:
             setattr(self._setup[0], kwarg, value)
         # apply the setup to the configuration
         LIBRARY.SMS_NTSC_SetupApply(self._config, self._setup)
+        if self.cache is not None:  # the cached rows are stale
+            self.cache.clear()
 
     def process(self):
         """Process the input pixels."""
-        LIBRARY.SMS_NTSC_Process(self._output, self._input, self._config)
+        if self.cache is not None:  # filter the rows through the cache
+            LIBRARY.SMS_NTSC_ProcessCached(self._output, self._input, self._config, self.cache._cache)
+        else:
+            LIBRARY.SMS_NTSC_Process(self._output, self._input, self._config)
+
+    def process_yuv(self, y, u, v):
+        """
+        Process the input pixels into planar BT.601 limited-range YUV.
+
+        Args:
+            y: the C-contiguous uint8 array to write the Y plane to with the
+                height and width of `output`
+            u: the C-contiguous uint8 array to write the U plane to with half
+                of the height and width of `output` rounded up for 4:2:0
+                chroma, or the height and width of `output` for 4:4:4 chroma
+            v: the C-contiguous uint8 array to write the V plane to with the
+                shape of `u`
+
+        Returns:
+            None
+
+        """
+        subsample = yuv_subsampling(self.output.shape[:2], y, u, v)
+        cache = None if self.cache is None else self.cache._cache
+        LIBRARY.SMS_NTSC_ProcessYUV(y.ctypes.data, u.ctypes.data, v.ctypes.data, self._input, self._config, cache, subsample)
+
+    def process_preview(self, step=4, output=None):
+        """
+        Process the input pixels into a reduced-size preview.
+
+        The preview samples every `step`-th row and column of `output` with
+        the kernel table of the current setup, so it matches the full-size
+        output at those pixels without filtering the pixels in between.
+
+        Args:
+            step: the step between sampled output pixels as an integer or a
+                pair of integers for the rows and the columns
+            output: the C-contiguous HW3 uint8 array to write the preview to
+                with the height and width of `output` divided by the step and
+                rounded up, or None to allocate a new array
+
+        Returns:
+            the HW3 uint8 array of the preview
+
+        """
+        output, row_step, column_step = preview_output(self.output.shape[:2], step, output)
+        LIBRARY.SMS_NTSC_ProcessPreview(output.ctypes.data, self._input, self._config, row_step, column_step)
+        return output
+
+    def _process_batch(self, output, input, bounds):
+        """
+        Process a batch of frames with a single call to the native filter.
+
+        Args:
+            output: the contiguous NHW3 uint8 array to write the RGB output to
+            input: the contiguous NHW1 array of input frames in the format of
+                `input`
+            bounds: the tuple of (top, bottom, row step, left, right, column
+                step) that selects the output pixels to keep
+
+        Returns:
+            None
+
+        """
+        cache = None if self.cache is None else self.cache._cache
+        LIBRARY.SMS_NTSC_ProcessBatch(output.ctypes.data, input.ctypes.data, self._config, cache, len(input), *bounds)
 
 
 # explicitly define the outward facing API of this module
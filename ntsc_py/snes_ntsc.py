@@ -1,7 +1,8 @@
 """A CTypes interface to Blargg's C++ SNES NTSC filter."""
 import ctypes
 from ._library import LIBRARY
-from .utility import ndarray_from_byte_buffer
+from .row_cache import RowCache
+from .utility import ndarray_from_byte_buffer, preview_output, yuv_subsampling
 
 
 # setup the argument and return types for SNES_NTSC_HEIGHT
@@ -91,18 +92,34 @@ LIBRARY.SNES_NTSC_DestroyOutputPixels.restype = None
 # setup the argument and return types for SNES_NTSC_Process
 LIBRARY.SNES_NTSC_Process.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.POINTER(snes_ntsc_t), ctypes.c_bool]
 LIBRARY.SNES_NTSC_Process.restype = None
+# setup the argument and return types for SNES_NTSC_ProcessCached
+LIBRARY.SNES_NTSC_ProcessCached.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.POINTER(snes_ntsc_t), ctypes.c_void_p, ctypes.c_bool]
+LIBRARY.SNES_NTSC_ProcessCached.restype = None
+# setup the argument and return types for SNES_NTSC_ProcessYUV
+LIBRARY.SNES_NTSC_ProcessYUV.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.POINTER(snes_ntsc_t), ctypes.c_void_p, ctypes.c_bool, ctypes.c_bool]
+LIBRARY.SNES_NTSC_ProcessYUV.restype = None
+# setup the argument and return types for SNES_NTSC_ProcessPreview
+LIBRARY.SNES_NTSC_ProcessPreview.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.POINTER(snes_ntsc_t), ctypes.c_bool, ctypes.c_uint, ctypes.c_uint]
+LIBRARY.SNES_NTSC_ProcessPreview.restype = None
+# setup the argument and return types for SNES_NTSC_ProcessBatch
+LIBRARY.SNES_NTSC_ProcessBatch.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.POINTER(snes_ntsc_t), ctypes.c_void_p, ctypes.c_uint, ctypes.c_bool, *[ctypes.c_uint] * 6]
+LIBRARY.SNES_NTSC_ProcessBatch.restype = None
 
 
 class SNES_NTSC:
     """A graphical filter that models the Super Nintendo Entertainment System."""
 
-    def __init__(self, mode='rgb', flicker=False, **kwargs):
+    def __init__(self, mode='rgb', flicker=False, cache_size=None, **kwargs):
         """
         Initialize a new SNES_NTSC graphical filter.
 
         Args:
             mode: the video mode to initialize the filter with
             flicker: whether to flicker between renders
+            cache_size: the number of bytes to cache filtered rows in, or None
+                to disable the cache. rows that repeat from frame to frame, like
+                static backgrounds and borders, are copied from the cache
+                instead of being filtered again
             **kwargs: the keyword arguments to pass to the setup structure
 
         Returns:
@@ -125,6 +142,8 @@ class SNES_NTSC:
         # setup the flicker effect
         self.flicker = flicker
         self._is_even_frame = False
+        # setup the cache of filtered rows
+        self.cache = None if cache_size is None else RowCache(cache_size)
         # setup the mode
         self.setup(mode=mode, **kwargs)
 
@@ -164,12 +183,107 @@ class SNES_NTSC:
             setattr(self._setup[0], kwarg, value)
         # apply the setup to the configuration
         LIBRARY.SNES_NTSC_SetupApply(self._config, self._setup)
+        if self.cache is not None:  # the cached rows are stale
+            self.cache.clear()
 
-    def process(self):
-        """Process the input pixels."""
+    def process(self, is_even_frame=None):
+        """
+        Process the input pixels.
+
+        Args:
+            is_even_frame: the field to render, e.g., derived from the index
+                of the frame, or None to alternate between the fields on every
+                call if flickering
+
+        Returns:
+            None
+
+        """
+        if is_even_frame is not None:  # render the given field
+            self._is_even_frame = bool(is_even_frame)
+        elif self.flicker:  # flip the even frame accumulator if flickering
+            self._is_even_frame = not self._is_even_frame
+        if self.cache is not None:  # filter the rows through the cache
+            LIBRARY.SNES_NTSC_ProcessCached(self._output, self._input, self._config, self.cache._cache, self._is_even_frame)
+        else:
+            LIBRARY.SNES_NTSC_Process(self._output, self._input, self._config, self._is_even_frame)
+
+    def process_yuv(self, y, u, v, is_even_frame=None):
+        """
+        Process the input pixels into planar BT.601 limited-range YUV.
+
+        Args:
+            y: the C-contiguous uint8 array to write the Y plane to with the
+                height and width of `output`
+            u: the C-contiguous uint8 array to write the U plane to with half
+                of the height and width of `output` rounded up for 4:2:0
+                chroma, or the height and width of `output` for 4:4:4 chroma
+            v: the C-contiguous uint8 array to write the V plane to with the
+                shape of `u`
+            is_even_frame: the field to render, e.g., derived from the index
+                of the frame, or None to alternate between the fields on every
+                call if flickering
+
+        Returns:
+            None
+
+        """
+        subsample = yuv_subsampling(self.output.shape[:2], y, u, v)
+        if is_even_frame is not None:  # render the given field
+            self._is_even_frame = bool(is_even_frame)
+        elif self.flicker:  # flip the even frame accumulator if flickering
+            self._is_even_frame = not self._is_even_frame
+        cache = None if self.cache is None else self.cache._cache
+        LIBRARY.SNES_NTSC_ProcessYUV(y.ctypes.data, u.ctypes.data, v.ctypes.data, self._input, self._config, cache, subsample, self._is_even_frame)
+
+    def process_preview(self, step=4, output=None, is_even_frame=None):
+        """
+        Process the input pixels into a reduced-size preview.
+
+        The preview samples every `step`-th row and column of `output` with
+        the kernel table of the current setup, so it matches the full-size
+        output at those pixels without filtering the pixels in between. The
+        preview does not advance the flicker, so a preview after `process`
+        renders the same field as the full-size output of that frame.
+
+        Args:
+            step: the step between sampled output pixels as an integer or a
+                pair of integers for the rows and the columns
+            output: the C-contiguous HW3 uint8 array to write the preview to
+                with the height and width of `output` divided by the step and
+                rounded up, or None to allocate a new array
+            is_even_frame: the field to render, or None to render the field of
+                the last call to `process`
+
+        Returns:
+            the HW3 uint8 array of the preview
+
+        """
+        output, row_step, column_step = preview_output(self.output.shape[:2], step, output)
+        if is_even_frame is None:  # render the field of the last frame
+            is_even_frame = self._is_even_frame
+        LIBRARY.SNES_NTSC_ProcessPreview(output.ctypes.data, self._input, self._config, bool(is_even_frame), row_step, column_step)
+        return output
+
+    def _process_batch(self, output, input, bounds):
+        """
+        Process a batch of frames with a single call to the native filter.
+
+        Args:
+            output: the contiguous NHW3 uint8 array to write the RGB output to
+            input: the contiguous NHW1 array of input frames in the format of
+                `input`
+            bounds: the tuple of (top, bottom, row step, left, right, column
+                step) that selects the output pixels to keep
+
+        Returns:
+            None
+
+        """
         if self.flicker:  # flip the even frame accumulator if flickering
             self._is_even_frame = not self._is_even_frame
-        LIBRARY.SNES_NTSC_Process(self._output, self._input, self._config, self._is_even_frame)
+        cache = None if self.cache is None else self.cache._cache
+        LIBRARY.SNES_NTSC_ProcessBatch(output.ctypes.data, input.ctypes.data, self._config, cache, len(input), self._is_even_frame, *bounds)
 
 
 # explicitly define the outward facing API of this module
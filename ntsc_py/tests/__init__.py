@@ -0,0 +1 @@
+"""Test cases for the ntsc_py package."""
@@ -0,0 +1,80 @@
+"""Test cases for the out-of-core filtering of array files."""
+import os
+import tempfile
+from unittest import TestCase
+import numpy as np
+from ..array_file import filter_array_file
+from ..color import nes2rgb, rgb2nes
+from ..nes_ntsc import NES_NTSC
+
+
+class ShouldFilterArrayFile(TestCase):
+    """Test cases for `filter_array_file`."""
+
+    def setUp(self):
+        """Create a source file of random NES frames."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.directory.name, 'src.npy')
+        random = np.random.RandomState(0)
+        self.frames = random.randint(0, 64, (23, 240, 256), dtype=np.uint8)
+        np.save(self.src, self.frames)
+
+    def tearDown(self):
+        """Delete the source and destination files."""
+        self.directory.cleanup()
+
+    def _filter(self, name, **kwargs):
+        """Filter the source file and return the destination array."""
+        dst = os.path.join(self.directory.name, name)
+        frames = filter_array_file(self.src, dst, chunk=5, flicker=True, **kwargs)
+        self.assertEqual(len(self.frames), frames)
+        return np.load(dst)
+
+    def test_should_match_sequential_process(self):
+        ntsc = NES_NTSC(flicker=True)
+        expected = []
+        for frame in self.frames:
+            ntsc.input[..., 0] = frame
+            ntsc.process()
+            expected.append(ntsc.output.copy())
+        output = self._filter('dst.npy', processes=1)
+        self.assertTrue(np.array_equal(np.stack(expected), output))
+
+    def test_should_not_depend_on_processes(self):
+        output = self._filter('serial.npy', processes=1)
+        self.assertTrue(np.array_equal(output, self._filter('parallel.npy', processes=3)))
+
+    def test_should_resume_from_start(self):
+        output = self._filter('dst.npy', processes=1)
+        # corrupt the frames after the resume point and filter them again
+        dst = os.path.join(self.directory.name, 'dst.npy')
+        destination = np.load(dst, mmap_mode='r+')
+        destination[10:] = 0
+        destination.flush()
+        del destination
+        self.assertTrue(np.array_equal(output, self._filter('dst.npy', processes=1, start=10)))
+
+    def test_should_report_checkpoints(self):
+        for processes in (1, 3):
+            checkpoints = []
+            self._filter('dst.npy', processes=processes, checkpoint=checkpoints.append)
+            self.assertEqual([5, 10, 15, 20, 23], checkpoints)
+
+    def test_should_convert_rgb_frames(self):
+        rgb = np.stack([nes2rgb(frame) for frame in self.frames])
+        # repeated palette colors map to the first index of the color
+        np.save(self.src, rgb2nes(rgb))
+        output = self._filter('dst.npy', processes=1)
+        np.save(self.src, rgb)
+        self.assertTrue(np.array_equal(output, self._filter('rgb.npy', processes=1)))
+
+    def test_should_reject_resume_with_wrong_dtype(self):
+        dst = os.path.join(self.directory.name, 'dst.npy')
+        output = self._filter('dst.npy', processes=1)
+        np.save(dst, output.astype(np.uint16))
+        with self.assertRaises(ValueError):
+            self._filter('dst.npy', processes=1, start=10)
+
+    def test_should_reject_invalid_console(self):
+        with self.assertRaises(ValueError):
+            filter_array_file(self.src, os.path.join(self.directory.name, 'dst.npy'), console='foo')
@@ -0,0 +1,38 @@
+"""Test cases for the color-space transformation functions."""
+from unittest import TestCase
+import numpy as np
+from ..color import NES_PALETTE, rgb2nes, nes2rgb
+
+
+def nearest_palette_index(img):
+    """Return the index of the nearest palette color of each pixel."""
+    distance = (img[..., None, :].astype(float) - NES_PALETTE.astype(float))**2
+    return np.argmin(np.mean(distance, axis=-1), axis=-1)[..., None].astype(np.uint8)
+
+
+class ShouldConvertRGB2NES(TestCase):
+    """Test cases for `rgb2nes`."""
+
+    def test_should_invert_nes2rgb(self):
+        random = np.random.RandomState(0)
+        indexes = random.randint(0, 64, (240, 256))
+        img = nes2rgb(indexes)
+        # repeated palette colors map to the first index of the color
+        self.assertTrue(np.array_equal(nearest_palette_index(img), rgb2nes(img)))
+        self.assertTrue(np.array_equal(img, nes2rgb(rgb2nes(img))))
+
+    def test_should_find_nearest_color(self):
+        random = np.random.RandomState(0)
+        img = random.randint(0, 256, (2, 40, 50, 3)).astype(np.uint8)
+        expected = nearest_palette_index(img)
+        # convert twice to cover both unknown and cached colors
+        self.assertTrue(np.array_equal(expected, rgb2nes(img)))
+        self.assertTrue(np.array_equal(expected, rgb2nes(img)))
+
+    def test_should_convert_batches(self):
+        random = np.random.RandomState(0)
+        img = nes2rgb(random.randint(0, 64, (4 * 240, 256))).reshape(4, 240, 256, 3)
+        output = rgb2nes(img)
+        self.assertEqual((4, 240, 256, 1), output.shape)
+        for frame, expected in zip(img, output):
+            self.assertTrue(np.array_equal(expected, rgb2nes(frame)))
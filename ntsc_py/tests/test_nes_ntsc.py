@@ -0,0 +1,107 @@
+"""Test cases for the NES NTSC filter."""
+from unittest import TestCase
+import numpy as np
+from ..nes_ntsc import NES_NTSC
+
+
+# the preset modes of the NES filter
+MODES = ['rgb', 'svideo', 'composite', 'monochrome']
+
+
+def random_frames(count=3, seed=0):
+    """Return a list of random HW1 frames of NES palette indexes."""
+    random = np.random.RandomState(seed)
+    return [random.randint(0, 64, (240, 256, 1), dtype=np.uint8) for _ in range(count)]
+
+
+# setups beyond the presets that move the sums of the fast path
+SETUPS = [
+    {'saturation': -1}, {'saturation': 0.5}, {'saturation': 1},
+    {'sharpness': -1}, {'sharpness': 1},
+    {'artifacts': -0.5, 'fringing': -0.5}, {'artifacts': 0.5, 'fringing': 0.5},
+    {'gamma': -1, 'resolution': -1}, {'gamma': -1, 'resolution': 1},
+    {'gamma': 1, 'resolution': -1}, {'brightness': 1}, {'contrast': 1},
+    {'bleed': 1},
+]
+
+
+def run_frames(colors=64, seed=0):
+    """Return a list of random HW1 frames with runs of 1, 2, and 8 colors."""
+    random = np.random.RandomState(seed)
+    frames = []
+    for run in [1, 2, 8]:
+        frame = random.randint(0, colors, (240, 256 // run, 1))
+        frames.append(np.repeat(frame, run, axis=1))
+    return frames
+
+
+def fast_difference(cls, frames, **kwargs):
+    """Return the fast error bound and largest difference from the reference."""
+    # accept any error to force the fast filter
+    fast = cls(mode='rgb', tolerance=255, **kwargs)
+    ref = cls(mode='rgb', **kwargs)
+    difference = 0
+    for frame in frames:
+        fast.input[:] = frame
+        ref.input[:] = frame
+        fast.process()
+        ref.process()
+        difference = max(difference, np.abs(fast.output.astype(int) - ref.output).max())
+    return fast.fast_error, difference
+
+
+class ShouldBoundFastError(TestCase):
+    """Test cases for the reduced-kernel fast path of `NES_NTSC`."""
+
+    def test_should_stay_within_fast_error(self):
+        for mode in MODES:
+            # accept any error to force the fast filter in every mode
+            fast = NES_NTSC(mode=mode, tolerance=255)
+            ref = NES_NTSC(mode=mode)
+            self.assertTrue(fast.is_fast)
+            self.assertFalse(ref.is_fast)
+            for frame in random_frames():
+                fast.input[:] = frame
+                ref.input[:] = frame
+                fast.process()
+                ref.process()
+                difference = np.abs(fast.output.astype(int) - ref.output)
+                self.assertLessEqual(difference.max(), fast.fast_error, mode)
+
+    def test_should_stay_within_fast_error_of_setups(self):
+        for kwargs in SETUPS:
+            fast_error, difference = fast_difference(NES_NTSC, run_frames(), **kwargs)
+            self.assertLessEqual(difference, fast_error, kwargs)
+
+    def test_should_refuse_fast_when_clamp_may_overflow(self):
+        ntsc = NES_NTSC(mode='rgb', artifacts=-0.5, fringing=-0.5, tolerance=130)
+        self.assertEqual(255, ntsc.fast_error)
+        self.assertFalse(ntsc.is_fast)
+
+    def test_should_enable_rgb_within_tolerance(self):
+        fast = NES_NTSC(mode='rgb', tolerance=6)
+        ref = NES_NTSC(mode='rgb')
+        self.assertTrue(fast.is_fast)
+        self.assertLessEqual(fast.fast_error, 6)
+        for frame in random_frames():
+            fast.input[:] = frame
+            ref.input[:] = frame
+            fast.process()
+            ref.process()
+            difference = np.abs(fast.output.astype(int) - ref.output)
+            self.assertLessEqual(difference.max(), 6)
+            self.assertLess(difference.mean(), 1.5)
+
+    def test_should_disable_modes_beyond_tolerance(self):
+        for mode in ['svideo', 'composite', 'monochrome']:
+            ntsc = NES_NTSC(mode=mode, tolerance=6)
+            self.assertGreater(ntsc.fast_error, 6, mode)
+            self.assertFalse(ntsc.is_fast, mode)
+
+    def test_should_update_fast_on_setup(self):
+        ntsc = NES_NTSC(mode='rgb', tolerance=6)
+        self.assertTrue(ntsc.is_fast)
+        ntsc.setup(mode='composite')
+        self.assertFalse(ntsc.is_fast)
+        ntsc.setup(mode='rgb')
+        self.assertTrue(ntsc.is_fast)
@@ -0,0 +1,99 @@
+"""Test cases for the NES NTSC filter with color emphasis."""
+from unittest import TestCase
+import numpy as np
+from ..nes_ntsc import NES_NTSC
+from ..nes_ntsc_emphasis import NES_NTSC_EMPHASIS
+from .test_nes_ntsc import MODES, SETUPS, fast_difference, random_frames, run_frames
+
+
+class ShouldMatchNES_NTSC(TestCase):
+    """Test cases for `NES_NTSC_EMPHASIS` against `NES_NTSC`."""
+
+    def _assert_equal_output(self, emphasis, ntsc, frames, high_bits=0):
+        """Assert that both filters produce the same output for frames."""
+        for frame in frames:
+            emphasis.input[:] = frame.astype(np.uint16) | high_bits
+            ntsc.input[:] = frame
+            emphasis.process()
+            ntsc.process()
+            self.assertTrue(np.array_equal(emphasis.output, ntsc.output))
+
+    def test_should_match_without_emphasis_bits(self):
+        for mode in MODES:
+            for kwargs in [{}, {'flicker': True}]:
+                emphasis = NES_NTSC_EMPHASIS(mode=mode, **kwargs)
+                ntsc = NES_NTSC(mode=mode, **kwargs)
+                self._assert_equal_output(emphasis, ntsc, random_frames())
+
+    def test_should_match_fast_without_emphasis_bits(self):
+        emphasis = NES_NTSC_EMPHASIS(mode='rgb', tolerance=6)
+        ntsc = NES_NTSC(mode='rgb', tolerance=6)
+        self.assertTrue(emphasis.is_fast)
+        self._assert_equal_output(emphasis, ntsc, random_frames())
+
+    def test_should_ignore_unused_high_bits(self):
+        emphasis = NES_NTSC_EMPHASIS()
+        ntsc = NES_NTSC()
+        self._assert_equal_output(emphasis, ntsc, random_frames(), high_bits=0xFE00)
+
+    def test_should_apply_emphasis_bits(self):
+        emphasis = NES_NTSC_EMPHASIS()
+        frame = random_frames(count=1)[0]
+        emphasis.input[:] = frame
+        emphasis.process()
+        output = emphasis.output.copy()
+        emphasis.input[:] = frame.astype(np.uint16) | 0x1C0
+        emphasis.process()
+        self.assertFalse(np.array_equal(output, emphasis.output))
+
+    def test_should_stay_within_fast_error(self):
+        fast = NES_NTSC_EMPHASIS(mode='rgb', tolerance=255)
+        ref = NES_NTSC_EMPHASIS(mode='rgb')
+        random = np.random.RandomState(0)
+        frame = random.randint(0, 512, fast.input.shape).astype(np.uint16)
+        fast.input[:] = frame
+        ref.input[:] = frame
+        fast.process()
+        ref.process()
+        difference = np.abs(fast.output.astype(int) - ref.output)
+        self.assertLessEqual(difference.max(), fast.fast_error)
+
+    def test_should_stay_within_fast_error_of_setups(self):
+        for kwargs in SETUPS:
+            frames = run_frames(colors=512)
+            fast_error, difference = fast_difference(NES_NTSC_EMPHASIS, frames, **kwargs)
+            self.assertLessEqual(difference, fast_error, kwargs)
+
+
+class ShouldTintEmphasis(TestCase):
+    """Test cases for the tint of the emphasis bits of `NES_NTSC_EMPHASIS`."""
+
+    def setUp(self):
+        # the 512-color palette of the RGB preset that Blargg's setup writes
+        self.ntsc = NES_NTSC_EMPHASIS(mode='rgb')
+        self.palette = np.zeros((512, 3), dtype=np.uint8)
+        self.ntsc.setup(palette_out=self.palette.ctypes.data)
+        self.ntsc.setup(palette_out=None)
+
+    def test_should_match_palette_out(self):
+        height, width, _ = self.ntsc.output.shape
+        for index in range(512):
+            self.ntsc.input[:] = index
+            self.ntsc.process()
+            # the center of a solid frame has the color of the palette
+            pixel = self.ntsc.output[height // 2, width // 2]
+            self.assertTrue(np.array_equal(self.palette[index], pixel), index)
+
+    def test_should_dim_other_channels(self):
+        # the red, green, and blue bits of $2001 (bits 5 to 7) in bits 6 to 8
+        for channel, emphasis in enumerate([1 << 6, 1 << 7, 1 << 8]):
+            for gray in [0x00, 0x10, 0x20]:
+                plain = self.palette[gray].astype(int)
+                tinted = self.palette[gray | emphasis].astype(int)
+                others = np.delete(tinted, channel)
+                self.assertTrue(np.all(others < plain[channel]), (gray, emphasis))
+                self.assertTrue(np.all(others < tinted[channel]), (gray, emphasis))
+        # every bit dims every channel of the gray
+        for gray in [0x00, 0x10, 0x20]:
+            tinted = self.palette[gray | 0x1C0].astype(int)
+            self.assertTrue(np.all(tinted < self.palette[gray]), gray)
@@ -0,0 +1,93 @@
+"""Test cases for the reduced-size previews of the filters."""
+from unittest import TestCase
+import numpy as np
+from ..nes_ntsc import NES_NTSC
+from ..nes_ntsc_emphasis import NES_NTSC_EMPHASIS
+from ..snes_ntsc import SNES_NTSC
+from .utility import filter_configurations, random_input
+
+
+# the steps between sampled rows and columns to test, the column steps cover
+# both filtering whole rows and filtering only the sampled pixels
+ROW_STEPS = range(1, 6)
+COLUMN_STEPS = [*range(1, 10), 11, 13, 16, 100, 601, 602, 700]
+
+
+class ShouldProcessPreview(TestCase):
+    """Test cases for `process_preview`."""
+
+    def test_should_sample_full_output(self):
+        for cls, kwargs in filter_configurations():
+            ntsc = cls(**kwargs)
+            ntsc.input[:] = random_input(ntsc, np.random.RandomState(0))
+            # process two frames to cover both fields when flickering
+            for _ in range(2):
+                ntsc.process()
+                for row_step in ROW_STEPS:
+                    for column_step in COLUMN_STEPS:
+                        preview = ntsc.process_preview((row_step, column_step))
+                        expected = ntsc.output[::row_step, ::column_step]
+                        self.assertTrue(np.array_equal(expected, preview), (cls, kwargs, row_step, column_step))
+
+    def test_should_not_advance_flicker(self):
+        for cls in (NES_NTSC, NES_NTSC_EMPHASIS, SNES_NTSC):
+            ntsc = cls(flicker=True)
+            ref = cls(flicker=True)
+            random = np.random.RandomState(0)
+            for _ in range(4):
+                frame = random_input(ntsc, random)
+                ntsc.input[:] = frame
+                ref.input[:] = frame
+                ntsc.process()
+                preview = ntsc.process_preview(3)
+                ref.process()
+                self.assertTrue(np.array_equal(ref.output, ntsc.output), cls)
+                self.assertTrue(np.array_equal(ref.output[::3, ::3], preview), cls)
+
+    def test_should_render_given_field(self):
+        for cls in (NES_NTSC, NES_NTSC_EMPHASIS, SNES_NTSC):
+            ntsc = cls()
+            ntsc.input[:] = random_input(ntsc, np.random.RandomState(0))
+            for is_even_frame in (False, True):
+                ntsc.process(is_even_frame=is_even_frame)
+                preview = ntsc.process_preview(2, is_even_frame=is_even_frame)
+                self.assertTrue(np.array_equal(ntsc.output[::2, ::2], preview), cls)
+
+    def test_should_write_to_output(self):
+        ntsc = NES_NTSC()
+        ntsc.input[:] = random_input(ntsc, np.random.RandomState(0))
+        ntsc.process()
+        output = np.zeros((60, 151, 3), dtype=np.uint8)
+        self.assertIs(output, ntsc.process_preview(4, output))
+        self.assertTrue(np.array_equal(ntsc.output[::4, ::4], output))
+
+    def test_should_accept_numpy_and_large_steps(self):
+        for cls, kwargs in filter_configurations():
+            ntsc = cls(**kwargs)
+            ntsc.input[:] = random_input(ntsc, np.random.RandomState(0))
+            ntsc.process()
+            for step in [np.int64(4), (np.int32(2), np.uint8(3)), 1 << 32, (1, 1 << 32), (1 << 64, 5)]:
+                preview = ntsc.process_preview(step)
+                rows, columns = (step, step) if np.ndim(step) == 0 else step
+                self.assertTrue(np.array_equal(ntsc.output[::rows, ::columns], preview), (cls, kwargs, step))
+
+    def test_should_reject_invalid_arguments(self):
+        ntsc = NES_NTSC()
+        for step in [0, -1, (4, 0), 4.0, (2, 3, 4), '4', None]:
+            with self.assertRaises(ValueError):
+                ntsc.process_preview(step)
+        with self.assertRaises(ValueError):
+            ntsc.process_preview(4, np.zeros((60, 150, 3), dtype=np.uint8))
+        with self.assertRaises(ValueError):
+            ntsc.process_preview(4, np.zeros((60, 151, 3), dtype=np.float32))
+
+    def test_should_bound_coarse_error(self):
+        for cls in (NES_NTSC, NES_NTSC_EMPHASIS):
+            ntsc = cls(mode='rgb')
+            ntsc.input[:] = random_input(ntsc, np.random.RandomState(0))
+            ntsc.process()
+            for step in [1, (2, 3), (1, 9), 16]:
+                preview = ntsc.process_preview(step, coarse=True)
+                rows, columns = (step, step) if isinstance(step, int) else step
+                difference = np.abs(preview.astype(int) - ntsc.output[::rows, ::columns])
+                self.assertLessEqual(difference.max(), ntsc.fast_error, (cls, step))
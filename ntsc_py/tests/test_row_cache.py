@@ -0,0 +1,92 @@
+"""Test cases for the cache of filtered rows."""
+from unittest import TestCase
+import numpy as np
+from ..row_cache import RowCache
+from .utility import FILTERS, filter_configurations, random_input
+
+
+class ShouldCacheRows(TestCase):
+    """Test cases for filters with a `RowCache`."""
+
+    def test_should_match_uncached_output(self):
+        for cls, kwargs in filter_configurations():
+            random = np.random.RandomState(0)
+            cached = cls(cache_size=1 << 24, **kwargs)
+            uncached = cls(**kwargs)
+            frames = [random_input(cached, random) for _ in range(2)]
+            # repeat frames and mix rows of both to hit and miss the cache
+            mixed = frames[0].copy()
+            mixed[::2] = frames[1][::2]
+            for frame in [frames[0], frames[0], frames[1], mixed, frames[0], mixed]:
+                cached.input[:] = frame
+                uncached.input[:] = frame
+                cached.process()
+                uncached.process()
+                self.assertTrue(np.array_equal(cached.output, uncached.output), (cls, kwargs))
+            self.assertGreater(cached.cache.hits, 0, (cls, kwargs))
+
+    def test_should_count_hits_and_misses(self):
+        for cls, _ in FILTERS:
+            ntsc = cls(cache_size=1 << 24)
+            ntsc.input[:] = random_input(ntsc, np.random.RandomState(0))
+            rows = len(ntsc.input)
+            ntsc.process()
+            self.assertEqual((0, rows), (ntsc.cache.hits, ntsc.cache.misses), cls)
+            ntsc.process()
+            self.assertEqual((rows, rows), (ntsc.cache.hits, ntsc.cache.misses), cls)
+
+    def test_should_invalidate_on_setup(self):
+        for cls, _ in FILTERS:
+            ntsc = cls(mode='rgb', cache_size=1 << 24)
+            ntsc.input[:] = random_input(ntsc, np.random.RandomState(0))
+            ntsc.process()
+            ntsc.setup(mode='composite')
+            ntsc.process()
+            self.assertEqual(0, ntsc.cache.hits, cls)
+            expected = cls(mode='composite')
+            expected.input[:] = ntsc.input
+            expected.process()
+            self.assertTrue(np.array_equal(expected.output, ntsc.output), cls)
+
+    def test_should_respect_budget(self):
+        for cls, _ in FILTERS:
+            ntsc = cls(cache_size=0)
+            ntsc.input[:] = random_input(ntsc, np.random.RandomState(0))
+            for _ in range(3):
+                ntsc.process()
+            self.assertEqual(0, ntsc.cache.hits, cls)
+            self.assertEqual(3 * len(ntsc.input), ntsc.cache.misses, cls)
+
+    def test_should_evict_least_recently_used_rows(self):
+        for cls, kwargs in filter_configurations():
+            random = np.random.RandomState(0)
+            uncached = cls(**kwargs)
+            # budget 16 of the rows of a frame to evict rows while filtering
+            rows = len(uncached.input)
+            row_bytes = (uncached.input.nbytes + uncached.output.nbytes) // rows + 128
+            evicting = cls(cache_size=16 * row_bytes, **kwargs)
+            cached = cls(cache_size=1 << 24, **kwargs)
+            frame = random_input(uncached, random)
+            # repeat a block of 6 rows, i.e., of every burst phase, within the budget
+            tiled = frame.copy()
+            tiled[6:] = np.resize(frame[:6], tiled[6:].shape)
+            for frame in [frame, frame, tiled, frame, tiled]:
+                for ntsc in [uncached, evicting, cached]:
+                    ntsc.input[:] = frame
+                    ntsc.process()
+                self.assertTrue(np.array_equal(evicting.output, uncached.output), (cls, kwargs))
+            self.assertGreater(evicting.cache.hits, 0, (cls, kwargs))
+            self.assertLess(evicting.cache.hits, cached.cache.hits, (cls, kwargs))
+
+    def test_should_clear(self):
+        cls, _ = FILTERS[0]
+        ntsc = cls(cache_size=1 << 24)
+        ntsc.input[:] = random_input(ntsc, np.random.RandomState(0))
+        ntsc.process()
+        ntsc.cache.clear()
+        ntsc.process()
+        self.assertEqual(0, ntsc.cache.hits)
+
+    def test_should_reject_negative_size(self):
+        with self.assertRaises(ValueError):
+            RowCache(-1)
@@ -0,0 +1,91 @@
+"""Test cases for the batched observation filter."""
+from unittest import TestCase
+import numpy as np
+from ..array_file import CONSOLES, _to_input
+from ..vector_ntsc import VectorNTSC
+from .utility import random_input
+
+
+# the crop and the downsample to test the batches with
+CROP = (8, 232), (3, 600)
+DOWNSAMPLE = 2, 3
+
+
+class ShouldMatchPerFrameProcess(TestCase):
+    """Test cases for `VectorNTSC` against `process` of each frame."""
+
+    def _assert_matches(self, console, kwargs, observations):
+        """Assert that a batch matches the cropped output of each frame."""
+        vector = VectorNTSC(len(observations), console, crop=CROP, downsample=DOWNSAMPLE, **kwargs)
+        ntsc = CONSOLES[console](**kwargs)
+        (top, bottom), (left, right) = CROP
+        rows, columns = DOWNSAMPLE
+        # process two batches to cover both fields when flickering
+        for _ in range(2):
+            output = vector(observations)
+            for index, observation in enumerate(observations):
+                ntsc.input[:] = _to_input(ntsc, observation)
+                if kwargs.get('flicker', False):  # every frame of a batch shares a field
+                    ntsc.process(is_even_frame=vector.ntsc._is_even_frame)
+                else:
+                    ntsc.process()
+                expected = ntsc.output[top:bottom:rows, left:right:columns]
+                self.assertTrue(np.array_equal(expected, output[index]), (console, kwargs, index))
+
+    def _configurations(self):
+        """Return the consoles and keyword arguments to test."""
+        for console in CONSOLES:
+            yield console, {}
+            yield console, {'cache_size': 1 << 24}
+            if console != 'sms':  # the SMS filter does not flicker
+                yield console, {'flicker': True}
+                yield console, {'flicker': True, 'cache_size': 1 << 24}
+
+    def test_should_match_indexes(self):
+        for console, kwargs in self._configurations():
+            ntsc = CONSOLES[console]()
+            random = np.random.RandomState(0)
+            observations = np.stack([random_input(ntsc, random) for _ in range(3)])
+            # NHW1 indexes
+            self._assert_matches(console, kwargs, observations)
+            # NHW indexes
+            self._assert_matches(console, kwargs, observations[..., 0])
+
+    def test_should_match_rgb(self):
+        random = np.random.RandomState(0)
+        observations = random.randint(0, 256, (3, 240, 256, 3)).astype(np.uint8)
+        for console, kwargs in self._configurations():
+            self._assert_matches(console, kwargs, observations)
+
+
+class ShouldValidateVectorNTSC(TestCase):
+    """Test cases for the arguments of `VectorNTSC`."""
+
+    def test_should_reject_invalid_console(self):
+        with self.assertRaises(ValueError):
+            VectorNTSC(2, console='foo')
+
+    def test_should_reject_invalid_crop(self):
+        for crop in [((0, 241), (0, 602)), ((8, 8), (0, 602)), ((0, 240), (-1, 602)), ((0, 240), (10, 5))]:
+            with self.assertRaises(ValueError, msg=crop):
+                VectorNTSC(2, crop=crop)
+
+    def test_should_reject_invalid_downsample(self):
+        for downsample in [0, -1, (1, 0), (1, 2, 3), 'a', 1.5]:
+            with self.assertRaises(ValueError, msg=downsample):
+                VectorNTSC(2, downsample=downsample)
+
+    def test_should_accept_numpy_and_large_downsample(self):
+        vector = VectorNTSC(2, downsample=np.int64(2))
+        self.assertEqual((2, 120, 301, 3), vector.output.shape)
+        vector = VectorNTSC(2, downsample=(2 ** 40, np.int32(2 ** 31 - 1)))
+        self.assertEqual((2, 1, 1, 3), vector.output.shape)
+        observations = np.zeros((2, 240, 256), dtype=np.uint8)
+        output = vector(observations)
+        vector.ntsc.process()
+        self.assertTrue(np.array_equal(vector.ntsc.output[:1, :1], output[0]))
+
+    def test_should_reject_wrong_batch_size(self):
+        vector = VectorNTSC(2)
+        with self.assertRaises(ValueError):
+            vector(np.zeros((3, 240, 256), dtype=np.uint8))
@@ -0,0 +1,106 @@
+"""Test cases for the planar YUV output of the filters."""
+from unittest import TestCase
+import numpy as np
+from ..color import rgb2yuv
+from ..nes_ntsc import NES_NTSC
+from ..utility import yuv_subsampling
+from .utility import filter_configurations, random_input
+
+
+def yuv_planes(ntsc, subsample):
+    """Return empty Y, U, and V planes for the output of a filter."""
+    height, width, _ = ntsc.output.shape
+    chroma = ((height + 1) // 2, (width + 1) // 2) if subsample else (height, width)
+    y = np.zeros((height, width), dtype=np.uint8)
+    return y, np.zeros(chroma, dtype=np.uint8), np.zeros(chroma, dtype=np.uint8)
+
+
+class ShouldProcessYUV(TestCase):
+    """Test cases for `process_yuv` against `rgb2yuv` of the RGB output."""
+
+    def test_should_match_reference_conversion(self):
+        configurations = filter_configurations()
+        # filter through the row cache too
+        configurations += [(cls, dict(kwargs, cache_size=1 << 24)) for cls, kwargs in configurations]
+        for cls, kwargs in configurations:
+            for subsample in (True, False):
+                rgb = cls(**kwargs)
+                yuv = cls(**kwargs)
+                random = np.random.RandomState(0)
+                # process two frames to cover both fields when flickering
+                for _ in range(2):
+                    frame = random_input(rgb, random)
+                    rgb.input[:] = frame
+                    yuv.input[:] = frame
+                    rgb.process()
+                    planes = yuv_planes(yuv, subsample)
+                    yuv.process_yuv(*planes)
+                    expected = rgb2yuv(rgb.output, subsample=subsample)
+                    for plane, reference in zip(planes, expected):
+                        difference = np.abs(plane.astype(int) - reference)
+                        self.assertLessEqual(difference.max(), 1, (cls, kwargs, subsample))
+
+    def test_should_render_given_field(self):
+        for cls, kwargs in filter_configurations():
+            if not kwargs.get('flicker'):
+                continue
+            rgb = cls(**kwargs)
+            yuv = cls(**kwargs)
+            frame = random_input(rgb, np.random.RandomState(0))
+            rgb.input[:] = frame
+            yuv.input[:] = frame
+            # repeat a field to render it out of the order of the flicker
+            for is_even_frame in [True, True, False, np.bool_(True)]:
+                rgb.process(is_even_frame=is_even_frame)
+                planes = yuv_planes(yuv, True)
+                yuv.process_yuv(*planes, is_even_frame=is_even_frame)
+                expected = rgb2yuv(rgb.output, subsample=True)
+                for plane, reference in zip(planes, expected):
+                    difference = np.abs(plane.astype(int) - reference)
+                    self.assertLessEqual(difference.max(), 1, (cls, kwargs, is_even_frame))
+                self.assertEqual(rgb._is_even_frame, yuv._is_even_frame)
+
+
+class ShouldValidateYUVPlanes(TestCase):
+    """Test cases for `yuv_subsampling`."""
+
+    shape = 240, 602
+
+    def test_should_detect_subsampling(self):
+        self.assertTrue(yuv_subsampling(self.shape, *yuv_planes(NES_NTSC(), True)))
+        self.assertFalse(yuv_subsampling(self.shape, *yuv_planes(NES_NTSC(), False)))
+
+    def test_should_reject_wrong_dtype(self):
+        y, u, v = yuv_planes(NES_NTSC(), True)
+        with self.assertRaises(ValueError):
+            yuv_subsampling(self.shape, y.astype(np.uint16), u, v)
+        with self.assertRaises(ValueError):
+            yuv_subsampling(self.shape, y, u, v.tolist())
+
+    def test_should_reject_wrong_shape(self):
+        y, u, v = yuv_planes(NES_NTSC(), True)
+        with self.assertRaises(ValueError):
+            yuv_subsampling(self.shape, y[1:], u, v)
+        with self.assertRaises(ValueError):
+            yuv_subsampling(self.shape, y, u[1:], v[1:])
+        with self.assertRaises(ValueError):
+            yuv_subsampling(self.shape, y, u, v[1:])
+
+    def test_should_reject_non_contiguous_planes(self):
+        y, u, v = yuv_planes(NES_NTSC(), False)
+        with self.assertRaises(ValueError):
+            yuv_subsampling(self.shape, np.zeros((240, 1204), dtype=np.uint8)[:, ::2], u, v)
+        with self.assertRaises(ValueError):
+            yuv_subsampling(self.shape, y, np.asfortranarray(u), v)
+
+    def test_should_reject_read_only_planes(self):
+        y, u, v = yuv_planes(NES_NTSC(), True)
+        y.flags.writeable = False
+        with self.assertRaises(ValueError):
+            yuv_subsampling(self.shape, y, u, v)
+
+    def test_should_validate_process_yuv(self):
+        ntsc = NES_NTSC()
+        y, u, v = yuv_planes(ntsc, True)
+        with self.assertRaises(ValueError):
+            ntsc.process_yuv(y, u.astype(np.float32), v)
@@ -0,0 +1,57 @@
+"""Utilities for the test cases of the ntsc_py package."""
+from ..nes_ntsc import NES_NTSC
+from ..nes_ntsc_emphasis import NES_NTSC_EMPHASIS
+from ..snes_ntsc import SNES_NTSC
+from ..sms_ntsc import SMS_NTSC
+
+
+# the filter classes and the number of distinct values of their input pixels
+FILTERS = [
+    (NES_NTSC, 1 << 6),
+    (NES_NTSC_EMPHASIS, 1 << 9),
+    (SNES_NTSC, 1 << 16),
+    (SMS_NTSC, 1 << 12),
+]
+
+
+def random_input(ntsc, random):
+    """
+    Return a random frame in the input format of a filter.
+
+    Args:
+        ntsc: the filter to create a frame for
+        random: the `numpy.random.RandomState` to draw the pixels from
+
+    Returns:
+        a random array with the shape and data type of `ntsc.input`
+
+    """
+    values = dict((cls, count) for cls, count in FILTERS)[type(ntsc)]
+    return random.randint(0, values, ntsc.input.shape).astype(ntsc.input.dtype)
+
+
+def filter_configurations():
+    """
+    Return the configurations to test each filter with.
+
+    Returns:
+        a list of tuples of a filter class and the keyword arguments to
+        create it with
+
+    """
+    configurations = []
+    for cls, _ in FILTERS:
+        configurations.append((cls, {}))
+        if cls is not SMS_NTSC:  # the SMS filter does not flicker
+            configurations.append((cls, {'flicker': True}))
+    configurations.append((NES_NTSC, {'tolerance': 6}))
+    configurations.append((NES_NTSC, {'tolerance': 6, 'flicker': True}))
+    return configurations
+
+
+# explicitly define the outward facing API of this module
+__all__ = [
+    'FILTERS',
+    filter_configurations.__name__,
+    random_input.__name__,
+]
@@ -1,6 +1,8 @@
 """Utility methods used in the project."""
 import sys
 import ctypes
+import numbers
+import operator
 import numpy as np
 
 
@@ -30,5 +32,102 @@ def ndarray_from_byte_buffer(pointer, shape, ctype=ctypes.c_byte, dtype=np.uint8
     return pixels
 
 
+def yuv_subsampling(shape, y, u, v):
+    """
+    Validate the planes of a YUV frame and return its chroma subsampling.
+
+    Args:
+        shape: the (height, width) of the frame in pixels
+        y: the Y plane to validate
+        u: the U plane to validate
+        v: the V plane to validate
+
+    Returns:
+        True if the U and V planes are 4:2:0, False if they are 4:4:4
+
+    """
+    height, width = shape
+    for name, plane in (('y', y), ('u', u), ('v', v)):
+        if not isinstance(plane, np.ndarray) or plane.dtype != np.uint8:
+            received = plane.dtype if isinstance(plane, np.ndarray) else type(plane)
+            raise ValueError(f'expected {name} to be a uint8 ndarray, but received {repr(received)}')
+        if not plane.flags.c_contiguous or not plane.flags.writeable:
+            raise ValueError(f'expected {name} to be a writeable C-contiguous ndarray')
+    if y.shape != (height, width):
+        raise ValueError(f'expected y with shape {repr((height, width))}, but received shape {repr(y.shape)}')
+    if u.shape != v.shape:
+        raise ValueError(f'expected u and v with the same shape, but received {repr(u.shape)} and {repr(v.shape)}')
+    if u.shape == (height, width):  # 4:4:4
+        return False
+    if u.shape == ((height + 1) // 2, (width + 1) // 2):  # 4:2:0
+        return True
+    raise ValueError(
+        f'expected u and v with shape {repr(((height + 1) // 2, (width + 1) // 2))} (4:2:0) '
+        f'or {repr((height, width))} (4:4:4), but received shape {repr(u.shape)}'
+    )
+
+
+def step_pair(step, shape, name='step'):
+    """
+    Validate a step between sampled pixels and clamp it to a shape.
+
+    Args:
+        step: the step as an integer or a pair of integers for the rows and
+            the columns
+        shape: the (height, width) of the pixels to step over. a step beyond
+            the shape samples only the first pixel, so larger steps are
+            clamped to it to fit the unsigned integers of the native code
+        name: the name of the step for error messages
+
+    Returns:
+        a tuple of the row step and the column step
+
+    """
+    if isinstance(step, numbers.Integral):
+        step = step, step
+    try:
+        row_step, column_step = (operator.index(value) for value in step)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} should be an integer or a pair of integers, but received {repr(step)}')
+    if row_step < 1 or column_step < 1:
+        raise ValueError(f'{name} should be positive, but received {repr(step)}')
+    height, width = shape
+    return min(row_step, height), min(column_step, width)
+
+
+def preview_output(shape, step, output=None):
+    """
+    Validate or allocate the output of a preview and return its steps.
+
+    Args:
+        shape: the (height, width) of the full-size output in pixels
+        step: the step between sampled output pixels as an integer or a pair
+            of integers for the rows and the columns, clamped to the shape
+        output: the HW3 uint8 array to validate, or None to allocate one
+
+    Returns:
+        a tuple of the output array, the row step, and the column step
+
+    """
+    row_step, column_step = step_pair(step, shape)
+    height, width = shape
+    expected = (height + row_step - 1) // row_step, (width + column_step - 1) // column_step, 3
+    if output is None:
+        return np.zeros(expected, dtype=np.uint8), row_step, column_step
+    if not isinstance(output, np.ndarray) or output.dtype != np.uint8:
+        received = output.dtype if isinstance(output, np.ndarray) else type(output)
+        raise ValueError(f'expected output to be a uint8 ndarray, but received {repr(received)}')
+    if not output.flags.c_contiguous or not output.flags.writeable:
+        raise ValueError('expected output to be a writeable C-contiguous ndarray')
+    if output.shape != expected:
+        raise ValueError(f'expected output with shape {repr(expected)}, but received shape {repr(output.shape)}')
+    return output, row_step, column_step
+
+
 # explicitly define the outward facing API of this module
-__all__ = [ndarray_from_byte_buffer.__name__]
+__all__ = [
+    ndarray_from_byte_buffer.__name__,
+    preview_output.__name__,
+    step_pair.__name__,
+    yuv_subsampling.__name__,
+]
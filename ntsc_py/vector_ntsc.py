@@ -0,0 +1,91 @@
+"""A batched NTSC filter for the observations of vectorized environments."""
+import numpy as np
+from .array_file import CONSOLES, _to_input
+from .utility import step_pair
+
+
+class VectorNTSC:
+    """A graphical filter that processes a batch of frames in one native call."""
+
+    def __init__(self, num_envs, console='nes', crop=None, downsample=1, **kwargs):
+        """
+        Initialize a new VectorNTSC graphical filter.
+
+        Args:
+            num_envs: the number of frames in each batch, i.e., the number of
+                environments in the vectorized environment
+            console: the console to filter for, one of 'nes', 'nes_emphasis',
+                'snes', or 'sms'
+            crop: an optional pair of (start, stop) bounds for the rows and
+                the columns of the full-size output to keep, e.g.,
+                `((8, 232), (0, 602))`
+            downsample: the step between kept output pixels as an integer or
+                a pair of integers for the rows and the columns
+            **kwargs: the keyword arguments to create the filter with, e.g.,
+                `mode`, `flicker`, and the fields of the setup structure
+
+        Returns:
+            None
+
+        """
+        if console not in CONSOLES:  # the console is invalid
+            raise ValueError(f'received invalid console: {repr(console)}, should be one of {set(CONSOLES.keys())}')
+        # a single filter shares its kernel table across every environment
+        self.ntsc = CONSOLES[console](**kwargs)
+        height, width, _ = self.ntsc.output.shape
+        if crop is None:
+            crop = (0, height), (0, width)
+        (top, bottom), (left, right) = crop
+        if not (0 <= top < bottom <= height and 0 <= left < right <= width):
+            raise ValueError(f'received invalid crop: {repr(crop)} for output with shape {repr((height, width))}')
+        row_step, column_step = step_pair(downsample, (bottom - top, right - left), name='downsample')
+        self._bounds = top, bottom, row_step, left, right, column_step
+        # create the input and output buffers for the batch
+        shape_input = num_envs, *self.ntsc.input.shape
+        self.input = np.zeros(shape_input, dtype=self.ntsc.input.dtype)
+        rows = len(range(top, bottom, row_step))
+        columns = len(range(left, right, column_step))
+        self.output = np.zeros((num_envs, rows, columns, 3), dtype=np.uint8)
+
+    def setup(self, mode=None, **kwargs):
+        """
+        Setup the filter.
+
+        Args:
+            mode: the base mode to start with if any
+            kwargs: the kwargs of the setup structure to set
+
+        Returns:
+            None
+
+        """
+        self.ntsc.setup(mode=mode, **kwargs)
+
+    def process(self):
+        """Process the batch of input pixels."""
+        self.ntsc._process_batch(self.output, self.input, self._bounds)
+
+    def __call__(self, observations):
+        """
+        Filter a batch of observations.
+
+        Args:
+            observations: the batch of observations from a step of the
+                vectorized environment as palette indexes in NHW or NHW1
+                format, or as RGB colors in NHW3 format
+
+        Returns:
+            the preallocated NHW3 `output` of the filter. the array is reused
+            by the next call, so copy it to keep the observations around
+
+        """
+        if len(observations) != len(self.input):
+            raise ValueError(f'expected {len(self.input)} observations, but received {len(observations)}')
+        # convert the whole batch to the native input format at once
+        self.input[:] = _to_input(self.ntsc, observations)
+        self.process()
+        return self.output
+
+
+# explicitly define the outward facing API of this module
+__all__ = [VectorNTSC.__name__]